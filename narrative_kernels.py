@@ -0,0 +1,294 @@
+import numpy as np
+import importlib.util
+import time
+import json
+import warnings
+from scipy.special import ndtr
+from typing import Dict, List, Tuple, Optional, Any
+
+# jax itself is only imported (and configured) when a JaxKernels is built
+HAS_JAX = importlib.util.find_spec('jax') is not None
+
+ANNUALIZATION = np.sqrt(252)
+LOG_EPSILON = 1e-10
+
+GREEK_NAMES = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x ** 2) / np.sqrt(2 * np.pi)
+
+def rolling_volatility(windows: np.ndarray) -> np.ndarray:
+    """Annualized log-return volatility of each row of a (n, w) price block
+    
+    Rows with fewer than two returns get 0, like calculate_narrative_volatility.
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    if windows.shape[1] < 3:
+        return np.zeros(len(windows))
+    returns = np.diff(np.log(windows + LOG_EPSILON), axis=1)
+    return returns.std(axis=1) * ANNUALIZATION
+
+def correlation_block(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Correlations between standardized (centered, unit-norm) price windows"""
+    return rows @ cols.T
+
+def belief_greeks_batch(spot: np.ndarray, strike: np.ndarray, expiry_years: np.ndarray,
+                        sigma: np.ndarray, is_call: np.ndarray, rate: float = 0.05) -> Dict[str, np.ndarray]:
+    """Black-Scholes Greeks for a whole book of belief options in one pass
+    
+    Expired, zero-vol or degenerate (non-positive spot/strike) contracts get
+    all-zero Greeks, matching the scalar calculate_belief_greeks.
+    """
+    spot, strike, T, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                   for a in (spot, strike, expiry_years, sigma)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), spot.shape)
+    valid = (T > 0) & (sigma > 0) & (spot > 0) & (strike > 0)
+    
+    # Harmless placeholders keep masked lanes finite
+    S = np.where(valid, spot, 1.0)
+    K = np.where(valid, strike, 1.0)
+    T = np.where(valid, T, 1.0)
+    sigma = np.where(valid, sigma, 1.0)
+    
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (rate + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    pdf_d1 = norm_pdf(d1)
+    discounted_K = K * np.exp(-rate * T)
+    
+    call_theta = (-S * pdf_d1 * sigma / (2 * sqrt_T) - rate * discounted_K * ndtr(d2)) / 365
+    put_theta = (-S * pdf_d1 * sigma / (2 * sqrt_T) + rate * discounted_K * ndtr(-d2)) / 365
+    
+    greeks = {
+        'delta': np.where(is_call, ndtr(d1), ndtr(d1) - 1),
+        'gamma': pdf_d1 / (S * sigma * sqrt_T),
+        'theta': np.where(is_call, call_theta, put_theta),
+        'vega': S * pdf_d1 * sqrt_T / 100,
+        'rho': np.where(is_call, discounted_K * T * ndtr(d2), -discounted_K * T * ndtr(-d2)) / 100,
+    }
+    return {name: np.where(valid, value, 0.0) for name, value in greeks.items()}
+
+def constant_product_swap(x: np.ndarray, y: np.ndarray, k: np.ndarray, fee_rate: np.ndarray,
+                          amount: np.ndarray, is_buy: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Vectorized execute_belief_swap math for independent pools
+    
+    Returns (new_belief_reserves, new_counter_reserves, received, fee, price_impact).
+    """
+    # Buying belief with counter-belief
+    buy_dx = k / (y + amount) - x
+    buy_fee = np.abs(buy_dx) * fee_rate
+    
+    # Selling belief for counter-belief
+    sell_dy = k / (x + amount) - y
+    sell_fee = np.abs(sell_dy) * fee_rate
+    
+    new_x = np.where(is_buy, x + buy_dx - buy_fee, x + amount)
+    new_y = np.where(is_buy, y + amount, y + sell_dy - sell_fee)
+    received = np.where(is_buy, np.abs(buy_dx), np.abs(sell_dy))
+    fee = np.where(is_buy, buy_fee, sell_fee)
+    impact = np.where(is_buy, np.abs(buy_dx) / x, np.abs(sell_dy) / y)
+    return new_x, new_y, received, fee, impact
+
+class NumpyKernels:
+    """Reference backend: the NumPy kernels above"""
+    
+    name = 'numpy'
+    
+    rolling_volatility = staticmethod(rolling_volatility)
+    correlation_block = staticmethod(correlation_block)
+    belief_greeks = staticmethod(belief_greeks_batch)
+    constant_product_swap = staticmethod(constant_product_swap)
+
+class JaxKernels:
+    """XLA-compiled backend with the same signatures as NumpyKernels
+    
+    Each kernel is written for a single element (one window, one contract,
+    one pool), lifted with ``vmap`` and compiled with ``jit``. Compilation
+    happens once per input shape, so batch lengths are padded up to the
+    next power of two (at least MIN_BUCKET) and the padding is sliced off
+    the results. Batches of any size then reuse one of a few compiled
+    shapes. Results come back as NumPy arrays.
+    
+    Building one imports jax and enables its float64 mode, which is
+    process-wide, so the kernels agree with the NumPy path.
+    """
+    
+    name = 'jax'
+    MIN_BUCKET = 64
+    
+    def __init__(self):
+        if not HAS_JAX:
+            raise ImportError("JaxKernels requires jax")
+        import jax
+        import jax.numpy as jnp
+        from jax.scipy.special import ndtr as jax_ndtr
+        jax.config.update('jax_enable_x64', True)
+        
+        def window_volatility(window):
+            returns = jnp.diff(jnp.log(window + LOG_EPSILON))
+            return jnp.std(returns) * ANNUALIZATION
+        
+        def contract_greeks(spot, strike, T, sigma, is_call, rate):
+            valid = (T > 0) & (sigma > 0) & (spot > 0) & (strike > 0)
+            S = jnp.where(valid, spot, 1.0)
+            K = jnp.where(valid, strike, 1.0)
+            T = jnp.where(valid, T, 1.0)
+            sigma = jnp.where(valid, sigma, 1.0)
+            
+            sqrt_T = jnp.sqrt(T)
+            d1 = (jnp.log(S / K) + (rate + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+            d2 = d1 - sigma * sqrt_T
+            pdf_d1 = jnp.exp(-0.5 * d1 ** 2) / jnp.sqrt(2 * jnp.pi)
+            discounted_K = K * jnp.exp(-rate * T)
+            decay = -S * pdf_d1 * sigma / (2 * sqrt_T)
+            
+            greeks = (
+                jnp.where(is_call, jax_ndtr(d1), jax_ndtr(d1) - 1),
+                pdf_d1 / (S * sigma * sqrt_T),
+                jnp.where(is_call, decay - rate * discounted_K * jax_ndtr(d2),
+                          decay + rate * discounted_K * jax_ndtr(-d2)) / 365,
+                S * pdf_d1 * sqrt_T / 100,
+                jnp.where(is_call, discounted_K * T * jax_ndtr(d2), -discounted_K * T * jax_ndtr(-d2)) / 100,
+            )
+            return tuple(jnp.where(valid, value, 0.0) for value in greeks)
+        
+        def pool_swap(x, y, k, fee_rate, amount, is_buy):
+            buy_dx = k / (y + amount) - x
+            buy_fee = jnp.abs(buy_dx) * fee_rate
+            sell_dy = k / (x + amount) - y
+            sell_fee = jnp.abs(sell_dy) * fee_rate
+            return (
+                jnp.where(is_buy, x + buy_dx - buy_fee, x + amount),
+                jnp.where(is_buy, y + amount, y + sell_dy - sell_fee),
+                jnp.where(is_buy, jnp.abs(buy_dx), jnp.abs(sell_dy)),
+                jnp.where(is_buy, buy_fee, sell_fee),
+                jnp.where(is_buy, jnp.abs(buy_dx) / x, jnp.abs(sell_dy) / y),
+            )
+        
+        self._volatility = jax.jit(jax.vmap(window_volatility))
+        self._correlation = jax.jit(lambda rows, cols: rows @ cols.T)
+        self._greeks = jax.jit(jax.vmap(contract_greeks, in_axes=(0, 0, 0, 0, 0, None)))
+        self._swap = jax.jit(jax.vmap(pool_swap))
+        
+    def _bucket(self, n: int) -> int:
+        return max(self.MIN_BUCKET, 1 << (n - 1).bit_length())
+    
+    def _pad(self, arrays, size: int, mode: str = 'edge'):
+        """Pad the leading axis of each array to ``size``
+        
+        Edge padding repeats a real element, so padded lanes stay finite.
+        """
+        padded = []
+        for a in arrays:
+            widths = [(0, size - len(a))] + [(0, 0)] * (a.ndim - 1)
+            padded.append(np.pad(a, widths, mode=mode))
+        return padded
+    
+    def rolling_volatility(self, windows: np.ndarray) -> np.ndarray:
+        windows = np.asarray(windows, dtype=np.float64)
+        n = len(windows)
+        if windows.shape[1] < 3 or n == 0:
+            return np.zeros(n)
+        windows, = self._pad([windows], self._bucket(n))
+        return np.asarray(self._volatility(windows))[:n]
+    
+    def correlation_block(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        n_rows, n_cols = len(rows), len(cols)
+        if n_rows == 0 or n_cols == 0:
+            return rows @ cols.T
+        rows, = self._pad([rows], self._bucket(n_rows), mode='constant')
+        cols, = self._pad([cols], self._bucket(n_cols), mode='constant')
+        return np.asarray(self._correlation(rows, cols))[:n_rows, :n_cols]
+    
+    def belief_greeks(self, spot, strike, expiry_years, sigma, is_call, rate: float = 0.05) -> Dict[str, np.ndarray]:
+        arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                       for a in (spot, strike, expiry_years, sigma)))
+        shape = arrays[0].shape
+        n = int(np.prod(shape))
+        if n == 0:
+            return belief_greeks_batch(spot, strike, expiry_years, sigma, is_call, rate)
+        flat = [a.ravel() for a in arrays]
+        is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), shape).ravel()
+        padded = self._pad(flat + [is_call], self._bucket(n))
+        values = self._greeks(*padded, rate)
+        return {name: np.asarray(value)[:n].reshape(shape) for name, value in zip(GREEK_NAMES, values)}
+    
+    def constant_product_swap(self, x, y, k, fee_rate, amount, is_buy) -> Tuple[np.ndarray, ...]:
+        n = len(x)
+        if n == 0:
+            return constant_product_swap(x, y, k, fee_rate, amount, is_buy)
+        arrays = [np.asarray(a) for a in (x, y, k, fee_rate, amount, is_buy)]
+        padded = self._pad(arrays, self._bucket(n))
+        return tuple(np.asarray(value)[:n] for value in self._swap(*padded))
+
+def get_kernels(backend: str = 'numpy'):
+    """Kernel backend by name; 'jax' falls back to NumPy when jax is missing"""
+    if backend == 'numpy':
+        return NumpyKernels()
+    if backend == 'jax':
+        if HAS_JAX:
+            return JaxKernels()
+        warnings.warn("jax is not installed; using the NumPy kernels", RuntimeWarning)
+        return NumpyKernels()
+    raise ValueError(f"Unknown kernel backend: {backend}")
+
+def benchmark_kernel_backends(sizes: Tuple[int, ...] = (100, 1_000, 10_000), window: int = 30,
+                              repeats: int = 5, seed: int = 0) -> List[Dict[str, Any]]:
+    """Time every kernel on each available backend across universe sizes
+    
+    Each timed call uses a different batch length between n / 2 and n,
+    as the engine's swap rounds and scan blocks do, so any recompilation
+    on new shapes is included. ``seconds`` is the median of ``repeats``
+    calls after one warm-up call at the full size; that warm-up's extra
+    cost is reported as compile_seconds. The correlation kernel is timed
+    on a block of up to 1000 rows against the universe, as the blocked
+    arbitrage scan uses it.
+    """
+    rng = np.random.default_rng(seed)
+    backends = [NumpyKernels()] + ([JaxKernels()] if HAS_JAX else [])
+    results = []
+    
+    for n in sizes:
+        prices = np.clip(0.5 + np.cumsum(rng.normal(0, 0.01, (n, window)), axis=1), 0.01, 0.99)
+        centered = prices - prices.mean(axis=1, keepdims=True)
+        z = centered / np.sqrt((centered ** 2).sum(axis=1, keepdims=True))
+        reserves = rng.uniform(1e4, 1e6, n)
+        options = (prices[:, -1], rng.uniform(0.1, 0.9, n), rng.uniform(0.01, 1.0, n),
+                   rng.uniform(0.1, 1.0, n), rng.random(n) < 0.5)
+        swaps = (reserves, reserves, reserves ** 2, np.full(n, 0.003),
+                 rng.uniform(1, 1000, n), rng.random(n) < 0.5)
+        
+        workloads = {
+            'rolling_volatility': lambda kernels, m: kernels.rolling_volatility(prices[:m]),
+            'correlation_block': lambda kernels, m: kernels.correlation_block(z[:min(m, 1000)], z[:m]),
+            'belief_greeks': lambda kernels, m: kernels.belief_greeks(*(a[:m] for a in options)),
+            'constant_product_swap': lambda kernels, m: kernels.constant_product_swap(*(a[:m] for a in swaps)),
+        }
+        lengths = rng.integers(max(1, n // 2), n + 1, repeats).tolist()
+        
+        for kernel, run in workloads.items():
+            for kernels in backends:
+                start = time.perf_counter()
+                run(kernels, n)
+                first_call = time.perf_counter() - start
+                
+                timings = []
+                for m in lengths:
+                    start = time.perf_counter()
+                    run(kernels, m)
+                    timings.append(time.perf_counter() - start)
+                    
+                seconds = float(np.median(timings))
+                results.append({
+                    'kernel': kernel,
+                    'backend': kernels.name,
+                    'universe': n,
+                    'seconds': seconds,
+                    'compile_seconds': max(first_call - seconds, 0.0)
+                })
+                
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_kernel_backends(), indent=2))
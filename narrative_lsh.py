@@ -0,0 +1,108 @@
+import numpy as np
+from typing import Tuple, Optional
+
+def simhash_collision_probability(correlation: float) -> float:
+    """Chance one random hyperplane puts two unit vectors on the same side"""
+    return 1 - np.arccos(np.clip(correlation, -1.0, 1.0)) / np.pi
+
+# Rough cost of comparing one candidate pair (bucketing, gathers, dot
+# product) in projection flops, which run at BLAS speed
+CANDIDATE_COST = 500
+
+def simhash_parameters(n: int, dim: int, threshold: float, recall: float,
+                       max_bits: int = 32) -> Tuple[int, int]:
+    """(bits per table, tables) meeting ``recall`` at ``threshold`` at least cost
+
+    A pair at the threshold collides in one table with probability p**bits,
+    so ``tables`` banded tables find it with probability
+    1 - (1 - p**bits)**tables >= recall; pairs above the threshold do better.
+    Bits trade hashing work (more tables) against candidate pairs (random
+    pairs collide with probability 0.5**bits per table); the cheapest
+    combination under a simple cost model is chosen.
+    """
+    p = simhash_collision_probability(threshold)
+    best = None
+    for bits in range(1, max_bits + 1):
+        hit = p ** bits
+        tables = 1 if hit >= 1 else int(np.ceil(np.log1p(-recall) / np.log1p(-hit)))
+        cost = tables * (n * bits * dim + 0.5 * n * n * 0.5 ** bits * CANDIDATE_COST)
+        if best is None or cost < best[0]:
+            best = (cost, bits, tables)
+    return best[1], best[2]
+
+def bucket_pairs(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """All (i, j), i < j, of rows sharing a key, generated without Python loops"""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.r_[0, np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1]
+    sizes = np.diff(np.r_[starts, len(keys)])
+
+    # Each position pairs with every later position of its bucket
+    position = np.arange(len(keys))
+    later = np.repeat(starts + sizes, sizes) - position - 1
+    total = int(later.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    first = np.repeat(position, later)
+    offsets = np.arange(total) - np.repeat(np.cumsum(later) - later, later)
+    second = first + 1 + offsets
+    i, j = order[first], order[second]
+    return np.minimum(i, j), np.maximum(i, j)
+
+def correlated_pairs_lsh(z: np.ndarray, threshold: float, recall: float = 0.95,
+                         bits: Optional[int] = None, tables: Optional[int] = None,
+                         seed: int = 0, pair_chunk: int = 2_000_000) -> Tuple[np.ndarray, ...]:
+    """Pairs of rows of ``z`` with dot product above ``threshold``, found by SimHash LSH
+
+    ``z`` holds centered, unit-norm windows, so dot products are
+    correlations. Each of ``tables`` hash tables keys rows on the signs of
+    ``bits`` random projections. Only rows sharing a key are compared
+    exactly, so memory stays O(n + candidates per table) rather than
+    O(n^2). Expected recall of pairs at the threshold is at least
+    ``recall`` (bits and tables are derived from it unless given). There
+    are no false positives. All-zero rows (flat windows) are skipped.
+    Matches are deduplicated whenever ``pair_chunk`` new ones accumulate,
+    so repeats across tables do not grow memory with the table count.
+
+    Returns (i, j, correlation, candidates_compared) with i < j.
+    """
+    n, dim = z.shape
+    rows = np.flatnonzero(np.any(z != 0, axis=1))
+    if bits is None or tables is None:
+        bits, tables = simhash_parameters(len(rows), dim, threshold, recall)
+
+    rng = np.random.default_rng(seed)
+    weights = np.left_shift(np.uint64(1), np.arange(bits, dtype=np.uint64))
+    vectors = z[rows]
+    found_keys, found_corr = [], []
+    pending = 0
+    compared = 0
+
+    for _ in range(tables):
+        planes = rng.standard_normal((dim, bits))
+        keys = ((vectors @ planes) > 0).astype(np.uint64) @ weights
+        first, second = bucket_pairs(keys)
+        compared += len(first)
+
+        for start in range(0, len(first), pair_chunk):
+            a, b = first[start:start + pair_chunk], second[start:start + pair_chunk]
+            correlation = np.einsum('ij,ij->i', vectors[a], vectors[b])
+            hit = correlation > threshold
+            found_keys.append(rows[a[hit]] * n + rows[b[hit]])
+            found_corr.append(correlation[hit])
+            pending += len(found_keys[-1])
+
+        # Strong pairs recur in most tables; collapse them before they pile up
+        if pending > pair_chunk:
+            found_keys, found_corr = _deduplicate(found_keys, found_corr)
+            pending = 0
+
+    (keys,), (correlation,) = _deduplicate(found_keys, found_corr)
+    return keys // n, keys % n, correlation, compared
+
+def _deduplicate(keys, correlations):
+    keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+    correlations = np.concatenate(correlations) if correlations else np.zeros(0)
+    keys, first = np.unique(keys, return_index=True)
+    return [keys], [correlations[first]]
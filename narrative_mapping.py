@@ -0,0 +1,113 @@
+import json
+import os
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'narrative_asset_rules.json')
+
+class AhoCorasick:
+    """Single-pass multi-pattern substring matcher
+
+    Patterns are compiled into a trie whose failure links point at the
+    longest proper suffix that is also a trie prefix; each state also
+    carries the patterns ending there, including via its failure chain.
+    Scanning a text is then one transition per character regardless of
+    the number of patterns. Matching is case-sensitive, like ``in``.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[int]] = [set()]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Empty patterns match everywhere and are not allowed")
+            state = 0
+            for char in pattern:
+                following = self._goto[state].get(char)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto[state][char] = following
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                state = following
+            self._output[state].add(index)
+
+        # Breadth-first, so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target if target != following else 0
+                self._output[following] |= self._output[self._fail[following]]
+
+    def matches(self, text: str) -> Set[int]:
+        """Indices of every pattern occurring in ``text``"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+class NarrativeAssetMapper:
+    """Keyword -> financial asset rules compiled into one Aho-Corasick automaton
+
+    A rule fires when any of its keywords occurs in the content; its asset
+    correlations are merged in rule order, so a later rule overrides an
+    earlier one for the same asset. Mappings are memoized by content (whose
+    str hash Python caches), so mapping a narrative again is a dict lookup.
+    Returned mappings are shared read-only views.
+    """
+
+    def __init__(self, rules: List[Tuple[List[str], Dict[str, float]]], max_cached: int = 1_000_000):
+        self.rules = [(list(keywords), dict(assets)) for keywords, assets in rules]
+        self.max_cached = max_cached
+
+        keywords = sorted({keyword for rule_keywords, _ in self.rules for keyword in rule_keywords})
+        self._matcher = AhoCorasick(keywords)
+        keyword_index = {keyword: i for i, keyword in enumerate(keywords)}
+        self._rules_for_keyword: List[List[int]] = [[] for _ in keywords]
+        for rule, (rule_keywords, _) in enumerate(self.rules):
+            for keyword in set(rule_keywords):
+                self._rules_for_keyword[keyword_index[keyword]].append(rule)
+
+        self._cache: Dict[str, Mapping[str, float]] = {}
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None, **kwargs) -> 'NarrativeAssetMapper':
+        """Load rules from JSON: {"rules": [{"keywords": [...], "assets": {...}}, ...]}"""
+        with open(path or DEFAULT_RULES_PATH) as f:
+            document = json.load(f)
+        rules = [(rule['keywords'], rule['assets']) for rule in document['rules']]
+        return cls(rules, **kwargs)
+
+    def map(self, content: str) -> Mapping[str, float]:
+        """Asset correlations for a narrative's content"""
+        mapping = self._cache.get(content)
+        if mapping is not None:
+            return mapping
+
+        fired = sorted({rule for keyword in self._matcher.matches(content)
+                        for rule in self._rules_for_keyword[keyword]})
+        assets: Dict[str, float] = {}
+        for rule in fired:
+            assets.update(self.rules[rule][1])
+
+        if len(self._cache) >= self.max_cached:
+            self._cache.clear()
+        mapping = self._cache[content] = MappingProxyType(assets)
+        return mapping
@@ -0,0 +1,288 @@
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Any
+
+from narrative_kernels import constant_product_swap
+
+class PoolArbitrageGraph:
+    """Negative-cycle search over the constant-product pool graph
+
+    Assets are nodes. Each pool adds two edges: base -> quote (sell belief)
+    and quote -> base (buy belief). Edge weights are -log of the pool's spot
+    price after its fee (y / x quote per base sold, x / y base per quote
+    spent), so a cycle with negative total weight turns an asset back into
+    more of itself at the margin. Fills follow execute_belief_swap, whose
+    fixed k_constant drifts away from x * y as fees leave the reserves; use
+    simulate_cycle to see what a given size actually returns.
+
+    The search is SPFA (queue-based Bellman-Ford) from a virtual source,
+    and it exits early once a path reaches as many hops as there are
+    nodes. Between calls the distance potentials of the last cycle-free
+    search are kept and repaired only around pools whose ``_revision``
+    moved:
+    - Tails of changed edges are re-queued.
+    - A raised tree edge invalidates its subtree, which is reset to the
+      virtual source and re-entered from its in-edges.
+    A tick that touches a few pools therefore stays local. After cycles
+    are found the potentials are discarded and the next call searches the
+    full graph.
+    """
+
+    EPSILON = 1e-12  # relaxation slack so break-even cycles cannot spin
+
+    def __init__(self, registry, min_profit: float = 1e-9):
+        self.registry = registry
+        self.min_profit = min_profit
+
+        self._node_of: Dict[str, int] = {}
+        self._assets: List[str] = []
+        self._out_edges: List[List[int]] = []
+        self._in_edges: List[List[int]] = []
+
+        # Edge 2 * slot sells the pool's base asset, 2 * slot + 1 buys it
+        self._tail: List[int] = []
+        self._head: List[int] = []
+        self._weight: List[float] = []
+        self._seen_revision = np.zeros(0, dtype=np.int64)
+
+        self._dist: List[float] = []
+        self._pred: List[int] = []  # edge into each node on its path, -1 from the source
+        self._hops: List[int] = []
+        self._valid = False
+        self._pending: set = set()  # nodes to re-relax on the next incremental search
+
+    # ------------------------------------------------------------------ graph
+
+    def _node(self, asset: str) -> int:
+        node = self._node_of.get(asset)
+        if node is None:
+            node = len(self._assets)
+            self._node_of[asset] = node
+            self._assets.append(asset)
+            self._out_edges.append([])
+            self._in_edges.append([])
+            self._dist.append(0.0)
+            self._pred.append(-1)
+            self._hops.append(0)
+        return node
+
+    def _edge_weights(self, slots: np.ndarray):
+        registry = self.registry
+        x = registry._belief_reserves[slots]
+        y = registry._counter_reserves[slots]
+        fee = registry._fee_rate[slots]
+        live = (x > 0) & (y > 0) & (fee < 1)
+        log_price = np.log(np.where(live, y, 1.0)) - np.log(np.where(live, x, 1.0))
+        log_fee = np.log1p(-np.where(live, fee, 0.0))
+        sell = np.where(live, -(log_price + log_fee), np.inf)
+        buy = np.where(live, log_price - log_fee, np.inf)
+        return sell, buy
+
+    def _rewire(self, slot: int) -> bool:
+        """Move a pool's edges onto its current assets; True if they moved"""
+        registry = self.registry
+        base_asset, quote_asset = registry._base_assets[slot], registry._quote_assets[slot]
+        sell = 2 * slot
+        if (self._assets[self._tail[sell]], self._assets[self._head[sell]]) == (base_asset, quote_asset):
+            return False
+
+        base = self._node(base_asset)
+        quote = self._node(quote_asset)
+        for edge, tail, head in ((sell, base, quote), (sell + 1, quote, base)):
+            self._out_edges[self._tail[edge]].remove(edge)
+            self._in_edges[self._head[edge]].remove(edge)
+            self._tail[edge] = tail
+            self._head[edge] = head
+            self._out_edges[tail].append(edge)
+            self._in_edges[head].append(edge)
+        return True
+
+    def refresh(self) -> int:
+        """Sync edges with pools created or changed since the last call
+
+        A pool re-created with different assets has its edges moved to the
+        new nodes, which discards the kept potentials. Returns the number
+        of pools whose edges were updated.
+        """
+        registry = self.registry
+        n_pools = len(registry)
+
+        known = len(self._seen_revision)
+        for slot in range(known, n_pools):
+            base = self._node(registry._base_assets[slot])
+            quote = self._node(registry._quote_assets[slot])
+            for tail, head in ((base, quote), (quote, base)):
+                edge = len(self._tail)
+                self._tail.append(tail)
+                self._head.append(head)
+                self._weight.append(np.inf)
+                self._out_edges[tail].append(edge)
+                self._in_edges[head].append(edge)
+        if n_pools > known:
+            self._seen_revision = np.concatenate([self._seen_revision,
+                                                  np.full(n_pools - known, -1, dtype=np.int64)])
+
+        revisions = registry._revision[:n_pools]
+        changed = np.flatnonzero(revisions != self._seen_revision)
+        if len(changed) == 0:
+            return 0
+        self._seen_revision[changed] = revisions[changed]
+
+        if any([self._rewire(slot) for slot in changed.tolist() if slot < known]):
+            self._valid = False
+
+        sell, buy = self._edge_weights(changed)
+        raised = []
+        for slot, sell_weight, buy_weight in zip(changed.tolist(), sell.tolist(), buy.tolist()):
+            for edge, weight in ((2 * slot, sell_weight), (2 * slot + 1, buy_weight)):
+                if weight > self._weight[edge] and self._pred[self._head[edge]] == edge:
+                    raised.append(edge)
+                self._weight[edge] = weight
+                self._pending.add(self._tail[edge])
+
+        if raised and self._valid:
+            self._invalidate_subtrees(raised)
+        return len(changed)
+
+    def _invalidate_subtrees(self, raised: List[int]):
+        """Reset every node whose path ran through a raised edge"""
+        children: Dict[int, List[int]] = {}
+        for node, edge in enumerate(self._pred):
+            if edge >= 0:
+                children.setdefault(self._tail[edge], []).append(node)
+
+        stack = [self._head[edge] for edge in raised]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            self._dist[node] = 0.0
+            self._pred[node] = -1
+            self._hops[node] = 0
+            stack.extend(children.get(node, ()))
+            self._pending.update(self._tail[edge] for edge in self._in_edges[node])
+
+    # ----------------------------------------------------------------- search
+
+    def _reset(self):
+        n = len(self._assets)
+        self._dist = [0.0] * n
+        self._pred = [-1] * n
+        self._hops = [0] * n
+
+    def _search(self, queue: deque, blocked: set) -> Optional[int]:
+        """Relax from ``queue``; returns a node whose path contains a negative cycle"""
+        dist, pred, hops = self._dist, self._pred, self._hops
+        head, weight, out_edges = self._head, self._weight, self._out_edges
+        limit = len(self._assets)
+        queued = [False] * limit
+        for node in queue:
+            queued[node] = True
+
+        while queue:
+            u = queue.popleft()
+            queued[u] = False
+            base = dist[u]
+            for edge in out_edges[u]:
+                v = head[edge]
+                candidate = base + weight[edge]
+                if candidate < dist[v] - self.EPSILON and edge not in blocked:
+                    dist[v] = candidate
+                    pred[v] = edge
+                    hops[v] = hops[u] + 1
+                    if hops[v] >= limit:
+                        return v
+                    if not queued[v]:
+                        queued[v] = True
+                        queue.append(v)
+        return None
+
+    def _extract_cycle(self, node: int) -> Optional[List[int]]:
+        """Negative cycle on the predecessor chain from ``node``, if there is one"""
+        position = {}
+        chain = []
+        while node not in position:
+            edge = self._pred[node]
+            if edge < 0:
+                return None
+            position[node] = len(chain)
+            chain.append(edge)
+            node = self._tail[edge]
+
+        cycle = chain[position[node]:][::-1]
+        if sum(self._weight[edge] for edge in cycle) >= 0:
+            return None
+        return cycle
+
+    def find_cycles(self, max_cycles: int = 10) -> List[Dict[str, Any]]:
+        """Profitable cycles after syncing with the registry, best first
+
+        When the previous search was cycle-free only the nodes around
+        changed pools are re-relaxed. Each cycle found has its weakest leg
+        blocked before the graph is searched again, so up to
+        ``max_cycles`` distinct cycles are returned.
+        """
+        self.refresh()
+        if self._valid:
+            queue = deque(sorted(self._pending))
+        else:
+            self._reset()
+            queue = deque(range(len(self._assets)))
+        self._pending = set()
+
+        threshold = -np.log1p(self.min_profit)
+        cycles = []
+        blocked = set()
+        for _ in range(4 * max_cycles):
+            node = self._search(queue, blocked)
+            if node is None:
+                break
+
+            cycle = self._extract_cycle(node)
+            if cycle is None:
+                # Predecessors moved on since the hop count was set; keep relaxing
+                queue = deque([node])
+                continue
+
+            blocked.add(max(cycle, key=self._weight.__getitem__))
+            if sum(self._weight[edge] for edge in cycle) < threshold:
+                cycles.append(cycle)
+                if len(cycles) >= max_cycles:
+                    break
+            self._reset()
+            queue = deque(range(len(self._assets)))
+
+        # Potentials are only reusable after a search that blocked nothing
+        self._valid = not blocked
+        reports = [self._describe(cycle) for cycle in cycles]
+        reports.sort(key=lambda report: report['profit_rate'], reverse=True)
+        return reports
+
+    def _describe(self, cycle: List[int]) -> Dict[str, Any]:
+        ids = self.registry._ids
+        return {
+            'assets': [self._assets[self._tail[edge]] for edge in cycle] + [self._assets[self._tail[cycle[0]]]],
+            'pools': [ids[edge // 2] for edge in cycle],
+            'directions': ['sell' if edge % 2 == 0 else 'buy' for edge in cycle],
+            'profit_rate': float(np.expm1(-sum(self._weight[edge] for edge in cycle)))
+        }
+
+    def simulate_cycle(self, cycle: Dict[str, Any], amount: float) -> float:
+        """Starting asset returned by routing ``amount`` around a reported cycle
+
+        Legs are applied in order to a copy of the reserves, so a pool that
+        appears twice sees its own earlier fill. Nothing is executed.
+        """
+        registry = self.registry
+        reserves = {}
+        for pool_id, direction in zip(cycle['pools'], cycle['directions']):
+            slot = registry._slot_of[pool_id]
+            x, y = reserves.get(slot, (registry._belief_reserves[slot], registry._counter_reserves[slot]))
+            new_x, new_y, received, _, _ = constant_product_swap(
+                x, y, registry._k_constant[slot], registry._fee_rate[slot], amount, direction == 'buy'
+            )
+            reserves[slot] = (new_x, new_y)
+            amount = float(received)
+        return amount
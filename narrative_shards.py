@@ -0,0 +1,217 @@
+import numpy as np
+import hashlib
+import heapq
+import multiprocessing as mp
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+# Per-narrative columns published to shard workers each cycle
+SHARD_COLUMNS = {
+    'belief_penetration': np.float64,
+    'volatility_30d': np.float64,
+    'liquidity_score': np.float64,
+    'coherence_rating': np.int8,  # RATING_CODES, -1 if unknown
+}
+
+def shard_of(narrative_id: str, n_shards: int) -> int:
+    """Stable shard index for a narrative id (md5, so it survives restarts)"""
+    digest = hashlib.md5(narrative_id.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little') % n_shards
+
+class SharedColumns:
+    """Named fixed-length arrays living in one SharedMemory block
+
+    The creating process owns the block and unlinks it; workers attach by
+    name and get zero-copy NumPy views.
+    """
+
+    def __init__(self, length: int, dtypes: Dict[str, Any], name: Optional[str] = None):
+        self.length = length
+        self.dtypes = {column: np.dtype(dtype) for column, dtype in dtypes.items()}
+        self.offsets = {}
+        size = 0
+        for column, dtype in self.dtypes.items():
+            size = -(-size // dtype.alignment) * dtype.alignment
+            self.offsets[column] = size
+            size += length * dtype.itemsize
+
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=max(size, 1))
+        self.columns = {
+            column: np.ndarray(length, dtype=dtype, buffer=self.memory.buf, offset=self.offsets[column])
+            for column, dtype in self.dtypes.items()
+        }
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def close(self):
+        self.columns = {}
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def _shard_worker(connection, name: str, length: int, dtypes: Dict[str, Any],
+                  ids: List[str], contents: List[str], scan_function: Callable):
+    """Worker loop: answer ('scan', top_k, context) requests until told to stop"""
+    shared = SharedColumns(length, dtypes, name=name)
+    cache: Dict[str, Any] = {}  # per-worker state for scan_function (static mappings, pools)
+    try:
+        while True:
+            request = connection.recv()
+            if request is None:
+                break
+            _, top_k, context = request
+            try:
+                connection.send(('ok', scan_function(ids, contents, shared.columns, top_k, context, cache)))
+            except Exception as error:
+                connection.send(('error', repr(error)))
+    finally:
+        shared.columns = {}
+        shared.memory.close()
+
+class ShardedUniverse:
+    """Narrative universe split across worker processes by stable hash
+
+    Each shard owns the narratives with ``shard_of(id) == shard``. Static
+    data (ids, contents) is shipped once when the workers start. Per-cycle
+    state (SHARD_COLUMNS) is copied from a MarketSnapshot into each shard's
+    shared memory block, so every shard scans the same tick and a scan
+    sends only a small request per worker. Workers run
+    ``scan_function(ids, contents, columns, top_k, context, cache)`` in
+    parallel. Each returns at most ``top_k`` results sorted by ``key``, and
+    the coordinator k-way merges them.
+
+    Workers restart when the snapshot's narratives change, including a
+    narrative replaced under the same id, or when a worker dies.
+    """
+
+    # MarketSnapshot column behind each SHARD_COLUMNS field
+    SNAPSHOT_COLUMNS = {
+        'belief_penetration': 'beliefs',
+        'volatility_30d': 'volatilities',
+        'liquidity_score': 'liquidity',
+        'coherence_rating': 'rating_codes',
+    }
+
+    def __init__(self, engine, n_shards: int, scan_function: Callable,
+                 key: Callable[[Any], Any] = lambda result: result, start_method: str = 'spawn'):
+        self.engine = engine
+        self.n_shards = n_shards
+        self.scan_function = scan_function
+        self.key = key
+        self._context = mp.get_context(start_method)
+        self._ids: Tuple[str, ...] = ()
+        self._narratives: List[Any] = []  # NarrativeAsset objects the workers were started with
+        self._shards: List[Tuple[Any, Any, SharedColumns, np.ndarray]] = []  # (process, connection, columns, rows)
+
+    def _members(self, snapshot) -> Tuple[Tuple[str, ...], List[Any]]:
+        """Snapshot ids still in the engine, and their narratives"""
+        narratives = self.engine.narrative_assets
+        ids = tuple(narrative_id for narrative_id in snapshot.ids if narrative_id in narratives)
+        return ids, [narratives[narrative_id] for narrative_id in ids]
+
+    def _current(self, ids: Tuple[str, ...], members: List[Any]) -> bool:
+        return (bool(self._shards) and ids == self._ids
+                and all(narrative is previous for narrative, previous in zip(members, self._narratives)))
+
+    def _start(self, snapshot, ids: Tuple[str, ...], members: List[Any]):
+        self.close()
+        rows: List[List[int]] = [[] for _ in range(self.n_shards)]
+        for narrative_id in ids:
+            rows[shard_of(narrative_id, self.n_shards)].append(snapshot.index[narrative_id])
+
+        for shard_rows in rows:
+            shard_rows = np.array(shard_rows, dtype=np.int64)
+            shard_ids = [snapshot.ids[row] for row in shard_rows.tolist()]
+            contents = [self.engine.narrative_assets[narrative_id].content for narrative_id in shard_ids]
+            shared = SharedColumns(len(shard_ids), SHARD_COLUMNS)
+            parent, child = self._context.Pipe()
+            process = self._context.Process(
+                target=_shard_worker,
+                args=(child, shared.name, len(shard_ids), SHARD_COLUMNS, shard_ids, contents, self.scan_function),
+                daemon=True
+            )
+            process.start()
+            child.close()
+            self._shards.append((process, parent, shared, shard_rows))
+        self._ids, self._narratives = ids, members
+
+    def sync(self, snapshot):
+        """Publish a snapshot's column values to every shard
+
+        Rows are positions in ``snapshot.ids``, which match the snapshot
+        the workers were started from.
+        """
+        for _, _, shared, rows in self._shards:
+            for name, column in shared.columns.items():
+                column[:] = getattr(snapshot, self.SNAPSHOT_COLUMNS[name])[rows]
+
+    def _request(self, top_k: int, context: Optional[Dict[str, Any]]) -> Tuple[List[Any], List[str], bool]:
+        """Send one scan to every shard and read every reply
+
+        Returns (results, errors, a worker died). Replies are always drained
+        so the next request never reads this one's answers.
+        """
+        sent = []
+        died = False
+        for _, connection, _, _ in self._shards:
+            try:
+                connection.send(('scan', top_k, context))
+                sent.append(connection)
+            except (BrokenPipeError, EOFError, OSError):
+                died = True
+
+        results, errors = [], []
+        for connection in sent:
+            try:
+                status, payload = connection.recv()
+            except (BrokenPipeError, EOFError, OSError):
+                died = True
+                continue
+            if status == 'ok':
+                results.append(payload)
+            else:
+                errors.append(payload)
+        return results, errors, died
+
+    def scan(self, snapshot, top_k: int = 100, context: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Best ``top_k`` results across shards for ``snapshot``, best first
+
+        Narratives removed from the engine since the snapshot are left out.
+        If a worker has died the shards are restarted and the scan retried
+        once; scan_function errors are raised after every reply is read.
+        """
+        ids, members = self._members(snapshot)
+        if not self._current(ids, members):
+            self._start(snapshot, ids, members)
+
+        for attempt in range(2):
+            self.sync(snapshot)
+            results, errors, died = self._request(top_k, context)
+            if not died:
+                break
+            self._start(snapshot, ids, members)
+        else:
+            raise RuntimeError("Shard workers died twice in one scan")
+
+        if errors:
+            raise RuntimeError(f"Shard scan failed: {errors[0]}")
+        return list(islice(heapq.merge(*results, key=self.key), top_k))
+
+    def close(self):
+        """Stop the workers and release their shared memory"""
+        for process, connection, shared, _ in self._shards:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+            shared.close()
+        self._shards = []
+        self._ids, self._narratives = (), []
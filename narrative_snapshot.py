@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+NARRATIVES_FILE = 'narratives.parquet'
+PRICES_FILE = 'prices.npy'
+POOLS_FILE = 'pools.parquet'
+NVX_FILE = 'nvx_history.parquet'
+
+def write_snapshot(directory: str, narratives: pd.DataFrame, prices: np.ndarray,
+                   pools: pd.DataFrame, nvx: pd.DataFrame,
+                   metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Write engine state as columnar files plus a manifest
+    
+    Layout of ``directory``:
+    
+    - narratives.parquet: one row per narrative, including the
+      ``history_offset``/``history_length`` of its prices
+    - prices.npy: every price history concatenated oldest first (float64)
+    - pools.parquet: one row per liquidity pool
+    - nvx_history.parquet: timestamp_ns, nvx, component_count
+    - manifest.json: format version, row counts and engine settings
+    
+    The manifest is written last, so a directory without one is an
+    incomplete snapshot.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+        
+    narratives.to_parquet(os.path.join(directory, NARRATIVES_FILE), index=False)
+    np.save(os.path.join(directory, PRICES_FILE), np.ascontiguousarray(prices, dtype=np.float64))
+    pools.to_parquet(os.path.join(directory, POOLS_FILE), index=False)
+    nvx.to_parquet(os.path.join(directory, NVX_FILE), index=False)
+    
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'narratives': len(narratives),
+        'prices': len(prices),
+        'pools': len(pools),
+        'nvx_points': len(nvx),
+        **(metadata or {})
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def read_snapshot(directory: str, mmap_prices: bool = True) -> Dict[str, Any]:
+    """Load a snapshot without an engine
+    
+    Returns ``{'manifest', 'narratives', 'prices', 'pools', 'nvx'}`` where
+    the tables are DataFrames and ``prices`` is the flat price array,
+    memory-mapped read-only by default. Use narrative_prices to slice one
+    narrative's history out of it.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"{directory} has no {MANIFEST_FILE}; snapshot is missing or incomplete")
+        
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+        
+    return {
+        'manifest': manifest,
+        'narratives': pd.read_parquet(os.path.join(directory, NARRATIVES_FILE)),
+        'prices': np.load(os.path.join(directory, PRICES_FILE), mmap_mode='r' if mmap_prices else None),
+        'pools': pd.read_parquet(os.path.join(directory, POOLS_FILE)),
+        'nvx': pd.read_parquet(os.path.join(directory, NVX_FILE)),
+    }
+
+def narrative_prices(snapshot: Dict[str, Any], narrative_id: str) -> np.ndarray:
+    """Price history of one narrative from a read_snapshot result"""
+    narratives = snapshot['narratives']
+    row = narratives.index[narratives['id'] == narrative_id]
+    if len(row) == 0:
+        raise KeyError(narrative_id)
+    offset = int(narratives.at[row[0], 'history_offset'])
+    length = int(narratives.at[row[0], 'history_length'])
+    return snapshot['prices'][offset:offset + length]
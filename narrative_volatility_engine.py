@@ -1,12 +1,585 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
+from scipy.special import ndtr
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import asyncio
-from collections import defaultdict, deque
+from collections import deque
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
 import hashlib
 import json
+import heapq
+from itertools import count
+
+from narrative_order_book import Fill, LimitOrder, NarrativeOrderBook, PoolRoute
+from nvx_timeseries import NVXTimeSeries, timestamps_to_ns
+from narrative_snapshot import read_snapshot, write_snapshot
+from narrative_pricing import monte_carlo_belief_prices
+from narrative_pool_graph import PoolArbitrageGraph
+from narrative_lsh import correlated_pairs_lsh
+from narrative_kernels import (GREEK_NAMES, NumpyKernels, norm_pdf, belief_greeks_batch,
+                               constant_product_swap, get_kernels)
+
+# Reality credit ratings, best to worst
+RATING_SCALE = ('AAA', 'AA', 'A', 'BBB', 'BB', 'B', 'CCC', 'D')
+RATING_CODES = {rating: code for code, rating in enumerate(RATING_SCALE)}
+
+# Storage dtypes for the price store ('float32' halves history memory)
+PRICE_PRECISIONS = {'float64': np.float64, 'float32': np.float32}
+
+class PriceHistoryStore:
+    """Engine-level struct-of-arrays ring buffer for narrative price histories
+
+    Every narrative owns one row (slot) of a single preallocated 2-D block.
+    Rows are mirrored - each value is written at ``i`` and ``i + capacity`` -
+    so the most recent ``n`` prices of any slot are always one contiguous,
+    zero-copy slice of the block.
+
+    Alongside the prices the store keeps Welford running moments of each
+    slot's log returns over the same window, updated on every append, so
+    rolling volatility is an O(1) read. Moments are recomputed exactly every
+    ``resync_interval`` appends to bound floating-point drift.
+
+    Scalar NarrativeAsset fields listed in ``MIRRORED_FIELDS`` are mirrored
+    into per-slot columns so universe-wide metrics can be computed as array
+    operations. ``version`` increments on every write, giving callers a cheap
+    market-state key for caching.
+
+    The same writes keep report aggregates current over active slots: the
+    volatility sum, per-rating counts and a lazy-deletion heap of beliefs
+    (stale entries are skipped on read and the heap is rebuilt once they
+    outnumber live ones).
+
+    ``dtype`` sets the storage precision of the price block and the float
+    field columns. float32 halves the dominant cost, 16 * capacity bytes
+    per slot for the mirrored block, e.g. 1.6 GB -> 0.8 GB for 100k
+    narratives of 1000 prices. Return moments, scan statistics and NVX
+    weights are still accumulated in float64, so the only extra error is
+    rounding each stored value (relative 2**-24 ~ 6e-8):
+    - Each log return moves by at most 2**-23, and so does the standard
+      deviation of the returns (std is a seminorm). Annualized volatility
+      is therefore within 2**-23 * sqrt(252) ~ 1.9e-6 of the float64 path.
+    - NVX is a weighted mean of those volatilities, times 100. Rounded
+      weights shift it by at most ~2.4e-7 relative, so NVX is within about
+      1.9e-4 + 2.4e-5 * NVX of the float64 value.
+    Correlations of float32 windows differ by ~1e-6. Ratings can flip
+    only for narratives whose coherence score sits within that of a
+    threshold.
+
+    Narrative timestamps are mirrored as int64 nanoseconds (naive wall
+    clock, like datetime64[ns]) whatever the dtype.
+    """
+
+    MIRRORED_FIELDS = {
+        'belief_penetration': '_belief',
+        'liquidity_score': '_liquidity',
+        'volatility_30d': '_volatility',
+        'mutation_rate': '_mutation',
+        'coherence_rating': '_rating',  # stored as RATING_CODES, -1 if unknown
+        'timestamp': '_timestamp_ns',
+    }
+
+    ANNUALIZATION = np.sqrt(252)
+    LOG_EPSILON = 1e-10
+
+    def __init__(self, capacity: int = 1000, initial_slots: int = 64,
+                 resync_interval: Optional[int] = None, dtype=np.float64):
+        self.capacity = capacity
+        self.resync_interval = resync_interval or capacity
+        self.dtype = np.dtype(dtype)
+        self._block = np.zeros((initial_slots, 2 * capacity), dtype=self.dtype)
+        self._head = np.zeros(initial_slots, dtype=np.int64)  # next write position
+        self._length = np.zeros(initial_slots, dtype=np.int64)
+        self._active = np.zeros(initial_slots, dtype=bool)
+        self._free_slots: List[int] = []
+        self._next_slot = 0
+        self.version = 0
+
+        # Mirrored narrative fields
+        self._belief = np.zeros(initial_slots, dtype=self.dtype)
+        self._liquidity = np.zeros(initial_slots, dtype=self.dtype)
+        self._volatility = np.zeros(initial_slots, dtype=self.dtype)
+        self._mutation = np.zeros(initial_slots, dtype=self.dtype)
+        self._rating = np.zeros(initial_slots, dtype=np.int8)
+        self._timestamp_ns = np.zeros(initial_slots, dtype=np.int64)
+
+        # Running log-return moments per slot
+        self._ret_count = np.zeros(initial_slots, dtype=np.int64)
+        self._ret_mean = np.zeros(initial_slots, dtype=np.float64)
+        self._ret_m2 = np.zeros(initial_slots, dtype=np.float64)
+        self._appends_since_resync = np.zeros(initial_slots, dtype=np.int64)
+
+        # Lifetime append count and rewrite generation, for streaming consumers
+        self._appends = np.zeros(initial_slots, dtype=np.int64)
+        self._generation = np.zeros(initial_slots, dtype=np.int64)
+
+        # Report aggregates over active slots
+        self.active_count = 0
+        self._volatility_sum = 0.0
+        self._rating_counts = np.zeros(len(RATING_SCALE), dtype=np.int64)
+        self._belief_stamp = np.zeros(initial_slots, dtype=np.int64)
+        self._belief_heap: List[Tuple[float, int, int]] = []  # (-belief, slot, stamp)
+
+        # Called after single-slot writes as observer(slot, field, value, previous);
+        # field is 'price' for appends and extends (with the last price).
+        # Multi-slot bulk writes do not notify.
+        self.observer: Optional[Callable[[int, str, Any, Any], None]] = None
+
+    def allocate(self) -> int:
+        """Reserve an empty row for a narrative"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._next_slot == self._block.shape[0]:
+                self._grow()
+            slot = self._next_slot
+            self._next_slot += 1
+
+        self.clear(slot)
+        self._active[slot] = True
+        self._rating[slot] = -1
+        self.active_count += 1
+        self._push_belief(slot)
+        return slot
+
+    def release(self, slot: int):
+        """Return a row to the free list"""
+        self.clear(slot)
+        self._volatility_sum -= self._volatility[slot]
+        self._count_ratings(self._rating[slot:slot + 1], -1)
+        for attr in self.MIRRORED_FIELDS.values():
+            getattr(self, attr)[slot] = 0
+        self._belief_stamp[slot] += 1
+        self._active[slot] = False
+        self.active_count -= 1
+        self._free_slots.append(slot)
+
+    def active_slots(self) -> np.ndarray:
+        """Indices of every allocated row"""
+        return np.flatnonzero(self._active[:self._next_slot])
+
+    def eligible_slots(self, min_length: int) -> np.ndarray:
+        """Allocated rows holding at least ``min_length`` prices"""
+        used = slice(0, self._next_slot)
+        return np.flatnonzero(self._active[used] & (self._length[used] >= min_length))
+
+    def set_field(self, slot: int, name: str, value: float):
+        """Mirror a NarrativeAsset field write into its column"""
+        column = getattr(self, self.MIRRORED_FIELDS[name])
+        previous = column[slot]
+        if name == 'coherence_rating':
+            value = RATING_CODES.get(value, -1)
+            self._count_ratings(column[slot:slot + 1], -1)
+            self._count_ratings(np.array([value]), 1)
+        elif name == 'timestamp':
+            value = timestamps_to_ns([value])[0]
+        elif name == 'volatility_30d':
+            value = column.dtype.type(value)
+            self._volatility_sum += float(value) - float(column[slot])
+        column[slot] = value
+        if name == 'belief_penetration':
+            self._push_belief(slot)
+        self.version += 1
+        if self.observer is not None:
+            self.observer(slot, name, value, previous)
+
+    def field_values(self, name: str, slots: np.ndarray) -> np.ndarray:
+        """Column of a mirrored field for the given slots"""
+        return getattr(self, self.MIRRORED_FIELDS[name])[slots]
+
+    def set_field_values(self, name: str, slots: np.ndarray, values) -> None:
+        """Vectorized set_field for many slots
+
+        Ratings may be given as rating strings or as RATING_CODES.
+        """
+        column = getattr(self, self.MIRRORED_FIELDS[name])
+        values = np.asarray(values)
+        if name == 'coherence_rating':
+            if values.dtype.kind in 'UO':
+                values = np.array([RATING_CODES.get(value, -1) for value in values.tolist()], dtype=np.int8)
+            self._count_ratings(column[slots], -1)
+            self._count_ratings(values, 1)
+        elif name == 'timestamp':
+            values = timestamps_to_ns(values)
+        column[slots] = values
+
+        if name == 'volatility_30d':
+            # Batch writes also re-anchor the running sum exactly
+            self._volatility_sum = float(self._volatility[self.active_slots()].sum(dtype=np.float64))
+        elif name == 'belief_penetration':
+            if 4 * len(slots) >= self.active_count:
+                self._rebuild_belief_heap()
+            else:
+                for slot in np.asarray(slots).tolist():
+                    self._push_belief(slot)
+        self.version += 1
+
+    # ------------------------------------------------------------ aggregates
+
+    def _count_ratings(self, codes: np.ndarray, delta: int):
+        codes = np.asarray(codes)
+        np.add.at(self._rating_counts, codes[codes >= 0], delta)
+
+    def _push_belief(self, slot: int):
+        self._belief_stamp[slot] += 1
+        heapq.heappush(self._belief_heap, (-float(self._belief[slot]), slot, int(self._belief_stamp[slot])))
+
+    def _rebuild_belief_heap(self):
+        slots = self.active_slots()
+        self._belief_stamp[slots] += 1
+        self._belief_heap = list(zip((-self._belief[slots]).tolist(), slots.tolist(),
+                                     self._belief_stamp[slots].tolist()))
+        heapq.heapify(self._belief_heap)
+
+    def volatility_sum(self) -> float:
+        """Sum of volatility_30d over active slots"""
+        return self._volatility_sum
+
+    def rating_counts(self) -> Dict[str, int]:
+        """Active narratives per rating, in RATING_SCALE order (unrated omitted)"""
+        return {rating: count for rating, count in zip(RATING_SCALE, self._rating_counts.tolist()) if count}
+
+    def top_belief_slots(self, k: int) -> List[int]:
+        """Up to ``k`` active slots with the highest belief, best first"""
+        heap = self._belief_heap
+        if len(heap) > 2 * self.active_count + 64:
+            self._rebuild_belief_heap()
+            heap = self._belief_heap
+
+        found = []
+        while heap and len(found) < k:
+            entry = heapq.heappop(heap)
+            _, slot, stamp = entry
+            if self._active[slot] and self._belief_stamp[slot] == stamp:
+                found.append(entry)
+        for entry in found:
+            heapq.heappush(heap, entry)
+        return [slot for _, slot, _ in found]
+
+    def _grow(self):
+        rows = self._block.shape[0]
+        new_rows = max(1, rows * 2)
+
+        block = np.zeros((new_rows, 2 * self.capacity), dtype=self._block.dtype)
+        block[:rows] = self._block
+        self._block = block
+        columns = ['_head', '_length', '_active', '_ret_count', '_ret_mean', '_ret_m2',
+                   '_appends_since_resync', '_appends', '_generation', '_belief_stamp']
+        for name in columns + list(self.MIRRORED_FIELDS.values()):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros(new_rows - rows, dtype=column.dtype)]))
+
+    def append(self, slot: int, value: float):
+        """Append one price to a slot, evicting the oldest when full"""
+        head = int(self._head[slot])
+        length = int(self._length[slot])
+        capacity = self.capacity
+
+        # Moments see the stored (possibly float32) prices, accumulated in float64
+        value = float(self.dtype.type(value))
+        if length > 0:
+            previous = float(self._block[slot, head + capacity - 1])
+            new_return = np.log(value + self.LOG_EPSILON) - np.log(previous + self.LOG_EPSILON)
+
+            if length < capacity:
+                # Window still filling - plain Welford insert
+                count = self._ret_count[slot] + 1
+                delta = new_return - self._ret_mean[slot]
+                self._ret_mean[slot] += delta / count
+                self._ret_m2[slot] += delta * (new_return - self._ret_mean[slot])
+                self._ret_count[slot] = count
+            else:
+                # Window full - the oldest return slides out as the new one enters
+                oldest = float(self._block[slot, head])
+                second = float(self._block[slot, head + 1])
+                old_return = np.log(second + self.LOG_EPSILON) - np.log(oldest + self.LOG_EPSILON)
+
+                count = self._ret_count[slot]
+                old_mean = self._ret_mean[slot]
+                new_mean = old_mean + (new_return - old_return) / count
+                self._ret_m2[slot] = max(
+                    0.0,
+                    self._ret_m2[slot] + (new_return - old_return) * (new_return - new_mean + old_return - old_mean)
+                )
+                self._ret_mean[slot] = new_mean
+
+        self._block[slot, head] = value
+        self._block[slot, head + capacity] = value
+
+        self._head[slot] = (head + 1) % capacity
+        if length < capacity:
+            self._length[slot] = length + 1
+
+        self.version += 1
+        self._appends[slot] += 1
+        self._appends_since_resync[slot] += 1
+        if self._appends_since_resync[slot] >= self.resync_interval:
+            self.resync(slot)
+        if self.observer is not None:
+            self.observer(slot, 'price', value, None)
+
+    def extend(self, slot: int, values) -> None:
+        """Bulk-append prices to a slot"""
+        values = np.asarray(values, dtype=self._block.dtype)[-self.capacity:]
+        if len(values) == 0:
+            return
+
+        head = int(self._head[slot])
+        positions = (head + np.arange(len(values))) % self.capacity
+        self._block[slot, positions] = values
+        self._block[slot, positions + self.capacity] = values
+
+        self._head[slot] = (head + len(values)) % self.capacity
+        self._length[slot] = min(self.capacity, int(self._length[slot]) + len(values))
+        self._generation[slot] += 1
+        self.resync(slot)
+        if self.observer is not None:
+            self.observer(slot, 'price', float(values[-1]), None)
+
+    def extend_empty(self, slots: np.ndarray, prices: np.ndarray, offsets: np.ndarray,
+                     lengths: np.ndarray) -> None:
+        """Bulk extend for many freshly allocated (empty) slots
+
+        Slot ``slots[i]`` receives ``prices[offsets[i]:offsets[i] + lengths[i]]``.
+        Slots are filled and resynced one vectorized pass per distinct length.
+        """
+        slots, offsets, lengths = (np.asarray(a, dtype=np.int64) for a in (slots, offsets, lengths))
+        for length in np.unique(lengths[lengths > 0]).tolist():
+            rows = np.flatnonzero(lengths == length)
+            kept = min(length, self.capacity)
+            group = slots[rows]
+            values = prices[offsets[rows, None] + np.arange(length - kept, length)].astype(self.dtype)
+
+            self._block[group[:, None], np.arange(kept)] = values
+            self._block[group[:, None], self.capacity + np.arange(kept)] = values
+            self._head[group] = kept % self.capacity
+            self._length[group] = kept
+            self._generation[group] += 1
+
+            returns = np.diff(np.log(values.astype(np.float64) + self.LOG_EPSILON), axis=1)
+            self._ret_count[group] = returns.shape[1]
+            if returns.shape[1]:
+                mean = returns.mean(axis=1)
+                self._ret_mean[group] = mean
+                self._ret_m2[group] = ((returns - mean[:, None]) ** 2).sum(axis=1)
+            self._appends_since_resync[group] = 0
+        self.version += 1
+
+    def clear(self, slot: int):
+        self._head[slot] = 0
+        self._length[slot] = 0
+        self._ret_count[slot] = 0
+        self._ret_mean[slot] = 0.0
+        self._ret_m2[slot] = 0.0
+        self._appends_since_resync[slot] = 0
+        self._generation[slot] += 1
+        self.version += 1
+
+    def resync(self, slot: int):
+        """Recompute a slot's return moments exactly from its window"""
+        returns = np.diff(np.log(self.window(slot).astype(np.float64) + self.LOG_EPSILON))
+        self._ret_count[slot] = len(returns)
+        self._ret_mean[slot] = returns.mean() if len(returns) else 0.0
+        self._ret_m2[slot] = ((returns - self._ret_mean[slot]) ** 2).sum() if len(returns) else 0.0
+        self._appends_since_resync[slot] = 0
+        self.version += 1
+
+    def volatility(self, slot: int) -> float:
+        """Annualized volatility of a slot's log returns, read in O(1)"""
+        count = self._ret_count[slot]
+        if count < 2:
+            return 0.0
+        return float(np.sqrt(self._ret_m2[slot] / count) * self.ANNUALIZATION)
+
+    def volatilities(self, slots: np.ndarray) -> np.ndarray:
+        """Annualized volatility for many slots in one vectorized pass"""
+        counts = self._ret_count[slots]
+        variance = self._ret_m2[slots] / np.maximum(counts, 1)
+        return np.where(counts >= 2, np.sqrt(variance) * self.ANNUALIZATION, 0.0)
+
+    def length(self, slot: int) -> int:
+        return int(self._length[slot])
+
+    def window(self, slot: int, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the most recent ``n`` prices (oldest first)"""
+        length = int(self._length[slot])
+        n = length if n is None else min(n, length)
+        end = int(self._head[slot]) + self.capacity
+        return self._block[slot, end - n:end]
+
+    def windows(self, slots: np.ndarray, n: int) -> np.ndarray:
+        """Stack the last ``n`` prices of many slots into an (len(slots), n) array
+
+        All slots must hold at least ``n`` prices. The result has the store's
+        dtype; callers that accumulate over it should upcast.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        start = self._head[slots] + self.capacity - n
+        columns = start[:, None] + np.arange(n)
+        return self._block[slots[:, None], columns]
+
+
+class PriceHistoryView:
+    """Deque-like handle onto one narrative's row of a PriceHistoryStore"""
+
+    __slots__ = ('store', 'slot')
+
+    def __init__(self, store: PriceHistoryStore, slot: int):
+        self.store = store
+        self.slot = slot
+
+    @property
+    def maxlen(self) -> int:
+        return self.store.capacity
+
+    def append(self, value: float):
+        self.store.append(self.slot, value)
+
+    def extend(self, values):
+        self.store.extend(self.slot, list(values))
+
+    def clear(self):
+        self.store.clear(self.slot)
+
+    def values(self) -> np.ndarray:
+        """Zero-copy array of the full history (oldest first)"""
+        return self.store.window(self.slot)
+
+    def window(self, n: int) -> np.ndarray:
+        """Zero-copy array of the last ``n`` prices"""
+        return self.store.window(self.slot, n)
+
+    def __len__(self) -> int:
+        return self.store.length(self.slot)
+
+    def __iter__(self):
+        return iter(self.values().tolist())
+
+    def __getitem__(self, index):
+        return self.values()[index]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values()
+        return values.astype(dtype) if dtype is not None else values.copy()
+
+    def __repr__(self) -> str:
+        return f"PriceHistoryView(slot={self.slot}, length={len(self)})"
+
+
+class RollingCorrelationTracker:
+    """Running sums, sums of squares and cross-products over a rolling window
+
+    Tracks the last ``window`` prices of a set of store slots. When every
+    tracked slot has advanced by the same number of prices since the last
+    refresh (the normal one-price-per-tick case) the sums are updated with
+    the added and evicted values only, instead of recomputing the window.
+    Rows whose variance falls to rounding scale (flat windows) are
+    recomputed exactly after such an update. Anything else - universe changes, uneven appends, rewritten histories,
+    or ``resync_interval`` incremental updates - triggers an exact rebuild.
+    """
+
+    FLAT_TOLERANCE = 1e-9  # variance below this share of the summed squares is rebuilt exactly
+
+    def __init__(self, store: 'PriceHistoryStore', window: int = 30,
+                 resync_interval: int = 1000):
+        self.store = store
+        self.window = window
+        self.resync_interval = resync_interval
+        self.slots = np.zeros(0, dtype=np.int64)
+        self._position: Dict[int, int] = {}
+        self._sums = np.zeros(0)
+        self._squares = np.zeros(0)
+        self._cross = np.zeros((0, 0))
+        self._synced_appends = np.zeros(0, dtype=np.int64)
+        self._synced_generation = np.zeros(0, dtype=np.int64)
+        self._updates_since_resync = 0
+
+    def rebuild(self, slots: np.ndarray):
+        """Exact recomputation from the store"""
+        prices = self.store.windows(slots, self.window).astype(np.float64)
+        self.slots = np.array(slots, dtype=np.int64)
+        self._position = {int(slot): i for i, slot in enumerate(self.slots)}
+        self._sums = prices.sum(axis=1)
+        self._squares = (prices ** 2).sum(axis=1)
+        self._cross = prices @ prices.T
+        self._synced_appends = self.store._appends[self.slots].copy()
+        self._synced_generation = self.store._generation[self.slots].copy()
+        self._updates_since_resync = 0
+
+    def refresh(self, slots: np.ndarray):
+        """Bring the sums up to date for ``slots``"""
+        if not np.array_equal(slots, self.slots) or not np.array_equal(
+                self.store._generation[slots], self._synced_generation):
+            self.rebuild(slots)
+            return
+
+        deltas = self.store._appends[slots] - self._synced_appends
+        steps = int(deltas[0]) if len(deltas) else 0
+        if steps == 0 and not deltas.any():
+            return
+
+        lockstep = (deltas == steps).all()
+        in_buffer = (self.store._length[slots] >= self.window + steps).all()
+        if not (lockstep and in_buffer) or self._updates_since_resync + steps > self.resync_interval:
+            self.rebuild(slots)
+            return
+
+        # Prices that entered and left the window since the last refresh
+        prices = self.store.windows(slots, self.window + steps).astype(np.float64)
+        removed, added = prices[:, :steps], prices[:, self.window:]
+        removed_squares = (removed ** 2).sum(axis=1)
+        self._sums += added.sum(axis=1) - removed.sum(axis=1)
+        self._squares += (added ** 2).sum(axis=1) - removed_squares
+        self._cross += added @ added.T - removed @ removed.T
+        self._synced_appends += steps
+        self._updates_since_resync += steps
+
+        # A window gone (nearly) flat keeps cancellation residue on the scale
+        # of the evicted values, which would become the variance divisor;
+        # such rows are recomputed exactly from the window itself.
+        variance = self._squares - self._sums ** 2 / self.window
+        tiny = np.flatnonzero(variance <= self.FLAT_TOLERANCE * (self._squares + removed_squares))
+        if len(tiny):
+            window = prices[:, steps:]
+            rows = window[tiny]
+            self._sums[tiny] = rows.sum(axis=1)
+            self._squares[tiny] = (rows ** 2).sum(axis=1)
+            cross = rows @ window.T
+            self._cross[tiny, :] = cross
+            self._cross[:, tiny] = cross.T
+
+    def _variances(self, positions) -> np.ndarray:
+        variance = self._squares[positions] - self._sums[positions] ** 2 / self.window
+        # Flat windows: treat rounding residue as zero variance
+        return np.where(variance > 1e-12 * np.maximum(self._squares[positions], 1e-300), variance, 0.0)
+
+    def correlation_rows(self, start: int, stop: int, column_start: int = 0) -> np.ndarray:
+        """Correlation of tracked rows [start, stop) against columns [column_start, n)"""
+        rows = slice(start, stop)
+        columns = slice(column_start, len(self.slots))
+        covariance = self._cross[rows, columns] - np.outer(self._sums[rows], self._sums[columns]) / self.window
+        scale = np.sqrt(np.outer(self._variances(rows), self._variances(columns)))
+        correlation = np.divide(covariance, scale, out=np.zeros_like(covariance), where=scale > 0)
+        return np.clip(correlation, -1.0, 1.0, out=correlation)
+
+    def pair_correlation(self, slot_1: int, slot_2: int) -> Optional[float]:
+        """Correlation of two tracked slots, or None if either is untracked"""
+        i, j = self._position.get(slot_1), self._position.get(slot_2)
+        if i is None or j is None:
+            return None
+        return float(self.correlation_rows(i, i + 1)[0, j])
+
+
+def price_window(history, n: Optional[int] = None) -> np.ndarray:
+    """Array of the last ``n`` prices from a PriceHistoryView or a plain deque"""
+    if isinstance(history, PriceHistoryView):
+        return history.values() if n is None else history.window(n)
+
+    prices = np.array(history, dtype=np.float64)
+    return prices if n is None else prices[-n:]
+
 
 @dataclass
 class NarrativeAsset:
@@ -22,6 +595,13 @@ class NarrativeAsset:
     mutation_rate: float = 0.0
     price_history: deque = field(default_factory=lambda: deque(maxlen=1000))
     
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # Keep the engine's columnar copy in sync once the asset is bound
+        history = self.__dict__.get('price_history')
+        if isinstance(history, PriceHistoryView) and name in PriceHistoryStore.MIRRORED_FIELDS:
+            history.store.set_field(history.slot, name, value)
+    
 @dataclass
 class BeliefDerivative:
     """Derivative instrument on narrative belief trajectories"""
@@ -33,15 +613,475 @@ class BeliefDerivative:
     implied_volatility: float = 0.0
     greek_values: Dict[str, float] = field(default_factory=dict)
 
+# Store fields whose single-narrative writes are published as events
+EVENT_KINDS = {'price': 'price', 'belief_penetration': 'belief', 'coherence_rating': 'rating'}
+
+@dataclass(frozen=True)
+class NarrativeEvent:
+    """Published to engine subscribers after a narrative update"""
+    kind: str  # 'price', 'belief' or 'rating'
+    narrative_id: str
+    value: Any  # new price, belief or rating
+    previous: Any = None  # previous belief or rating (None for prices)
+
+def _read_only(values) -> np.ndarray:
+    array = np.array(values)
+    array.setflags(write=False)
+    return array
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Immutable view of the market at one version, shared by every stage of a cycle
+    
+    Columns are read-only copies aligned with ``ids``; arbitrage
+    opportunities are read-only mappings. Build one with
+    NarrativeVolatilityEngine.market_snapshot.
+    """
+    version: int
+    timestamp: datetime
+    nvx: float
+    ids: Tuple[str, ...]
+    beliefs: np.ndarray
+    volatilities: np.ndarray
+    liquidity: np.ndarray
+    rating_codes: np.ndarray  # RATING_CODES, -1 if unknown
+    arbitrage_opportunities: Tuple[Mapping[str, Any], ...]
+    index: Mapping[str, int] = field(repr=False)
+    
+    def __contains__(self, narrative_id: str) -> bool:
+        return narrative_id in self.index
+    
+    def rating(self, narrative_id: str) -> Optional[str]:
+        code = int(self.rating_codes[self.index[narrative_id]])
+        return RATING_SCALE[code] if code >= 0 else None
+    
+    def belief(self, narrative_id: str) -> float:
+        return float(self.beliefs[self.index[narrative_id]])
+    
+    def volatility(self, narrative_id: str) -> float:
+        return float(self.volatilities[self.index[narrative_id]])
+    
+    def narrative_data(self, narrative_id: str) -> Dict[str, Any]:
+        """The narrative_data dict the signal modules take"""
+        row = self.index[narrative_id]
+        return {
+            'id': narrative_id,
+            'belief': float(self.beliefs[row]),
+            'volatility': float(self.volatilities[row]),
+            'coherence': self.rating(narrative_id)
+        }
+
+def belief_option_price_batch(spot: np.ndarray, strike: np.ndarray, expiry_years: np.ndarray,
+                              sigma: np.ndarray, is_call: np.ndarray, rate: float = 0.05) -> np.ndarray:
+    """Black-Scholes premiums for arrays of belief calls/puts
+    
+    Contracts at or past expiry are valued at intrinsic.
+    """
+    spot, strike, T, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                   for a in (spot, strike, expiry_years, sigma)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), spot.shape)
+    live = (T > 0) & (sigma > 0) & (spot > 0) & (strike > 0)
+    
+    S = np.where(live, spot, 1.0)
+    K = np.where(live, strike, 1.0)
+    T_safe = np.where(live, T, 1.0)
+    sigma = np.where(live, sigma, 1.0)
+    
+    sqrt_T = np.sqrt(T_safe)
+    d1 = (np.log(S / K) + (rate + 0.5 * sigma ** 2) * T_safe) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    discounted_K = K * np.exp(-rate * T_safe)
+    
+    price = np.where(is_call, S * ndtr(d1) - discounted_K * ndtr(d2),
+                     discounted_K * ndtr(-d2) - S * ndtr(-d1))
+    intrinsic = np.where(is_call, np.maximum(spot - strike, 0.0), np.maximum(strike - spot, 0.0))
+    return np.where(live, price, intrinsic)
+
+def implied_volatility_batch(premium: np.ndarray, spot: np.ndarray, strike: np.ndarray,
+                             expiry_years: np.ndarray, is_call: np.ndarray, rate: float = 0.05,
+                             tol: float = 1e-10, max_iter: int = 100,
+                             vol_bounds: Tuple[float, float] = (1e-6, 100.0)) -> np.ndarray:
+    """Back out implied volatilities for a whole option chain at once
+    
+    Runs a vectorized Newton iteration on every contract simultaneously.
+    Any lane whose Newton step leaves the current bracket (or whose vega
+    vanishes) takes a bisection step instead, so every solvable contract
+    converges. Premiums outside the attainable range give NaN.
+    """
+    premium, spot, strike, T = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                                     for a in (premium, spot, strike, expiry_years)))
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), premium.shape)
+    
+    lo = np.full(premium.shape, vol_bounds[0])
+    hi = np.full(premium.shape, vol_bounds[1])
+    price_lo = belief_option_price_batch(spot, strike, T, lo, is_call, rate)
+    price_hi = belief_option_price_batch(spot, strike, T, hi, is_call, rate)
+    solvable = (T > 0) & (spot > 0) & (strike > 0) & (premium >= price_lo - tol) & (premium <= price_hi + tol)
+    
+    # Brenner-Subrahmanyam starting guess
+    sigma = np.sqrt(2 * np.pi / np.where(T > 0, T, 1.0)) * premium / np.where(spot > 0, spot, 1.0)
+    sigma = np.clip(sigma, lo, hi)
+    active = solvable.copy()
+    
+    for _ in range(max_iter):
+        if not active.any():
+            break
+            
+        idx = np.flatnonzero(active)
+        S, K, t, vol = spot[idx], strike[idx], T[idx], sigma[idx]
+        diff = belief_option_price_batch(S, K, t, vol, is_call[idx], rate) - premium[idx]
+        
+        done = np.abs(diff) < tol
+        active[idx[done]] = False
+        
+        # Shrink the bracket around the root
+        hi[idx] = np.where(diff > 0, vol, hi[idx])
+        lo[idx] = np.where(diff < 0, vol, lo[idx])
+        
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(S / K) + (rate + 0.5 * vol ** 2) * t) / (vol * sqrt_t)
+        vega = S * norm_pdf(d1) * sqrt_t
+        
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            newton = vol - diff / vega
+        inside = (vega > 1e-12) & (newton > lo[idx]) & (newton < hi[idx])
+        step = np.where(inside, newton, 0.5 * (lo[idx] + hi[idx]))
+        sigma[idx] = np.where(done, vol, step)
+        
+    return np.where(solvable, sigma, np.nan)
+
+def coherence_scores_batch(volatility: np.ndarray, liquidity: np.ndarray,
+                           mutation_rate: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_coherence_score"""
+    coherence = (1 / (1 + volatility) * liquidity / (1 + mutation_rate)) ** (1 / 3)
+    return np.minimum(coherence, 1.0)
+
+def years_to_expiry(expiries, now: Optional[datetime] = None) -> np.ndarray:
+    """Whole days to expiry / 365 for an array of datetimes"""
+    now = np.datetime64(now or datetime.now(), 'us')
+    days = np.floor((np.asarray(expiries, dtype='datetime64[us]') - now) / np.timedelta64(1, 'D'))
+    return days / 365.0
+
+class NarrativeAssetRegistry(dict):
+    """narrative_assets mapping that binds assets to the engine's price store
+
+    Plain ``engine.narrative_assets[id] = narrative`` assignments keep working;
+    the narrative's history is moved into the shared store on insertion.
+    """
+
+    def __init__(self, engine: 'NarrativeVolatilityEngine'):
+        super().__init__()
+        self._engine = engine
+
+    def __setitem__(self, narrative_id: str, narrative: NarrativeAsset):
+        previous = self.get(narrative_id)
+        if previous is not None and previous is not narrative:
+            self._engine._unbind_narrative(previous)
+        super().__setitem__(narrative_id, narrative)
+        self._engine._bind_narrative(narrative)
+
+    def __delitem__(self, narrative_id: str):
+        self._engine._unbind_narrative(self[narrative_id])
+        super().__delitem__(narrative_id)
+
+    def pop(self, narrative_id: str, *default):
+        if narrative_id in self:
+            self._engine._unbind_narrative(self[narrative_id])
+        return super().pop(narrative_id, *default)
+
+    def popitem(self):
+        narrative_id, narrative = super().popitem()
+        self._engine._unbind_narrative(narrative)
+        return narrative_id, narrative
+
+    def clear(self):
+        for narrative in self.values():
+            self._engine._unbind_narrative(narrative)
+        super().clear()
+
+    def setdefault(self, narrative_id: str, narrative: NarrativeAsset = None):
+        if narrative_id not in self:
+            self[narrative_id] = narrative
+        return self[narrative_id]
+
+    def update(self, *args, **kwargs):
+        for narrative_id, narrative in dict(*args, **kwargs).items():
+            self[narrative_id] = narrative
+
+class PoolView(MutableMapping):
+    """Dict-style handle onto one pool of a LiquidityPoolRegistry"""
+    
+    __slots__ = ('registry', 'slot')
+    
+    def __init__(self, registry: 'LiquidityPoolRegistry', slot: int):
+        self.registry = registry
+        self.slot = slot
+        
+    def __getitem__(self, key: str):
+        if key == 'narrative_id':
+            return self.registry._ids[self.slot]
+        if key in LiquidityPoolRegistry.ASSET_KEYS:
+            return getattr(self.registry, LiquidityPoolRegistry.ASSET_KEYS[key])[self.slot]
+        return float(self.registry._column(key)[self.slot])
+    
+    def __setitem__(self, key: str, value: float):
+        if key == 'narrative_id' or key in LiquidityPoolRegistry.ASSET_KEYS:
+            raise KeyError(f'{key} is fixed at pool creation')
+        column = self.registry._column(key)
+        if key == 'total_liquidity':
+            self.registry._liquidity_sum += value - column[self.slot]
+        column[self.slot] = value
+        self.registry._revision[self.slot] += 1
+        
+    def __delitem__(self, key: str):
+        raise KeyError('pool fields cannot be removed')
+    
+    def __iter__(self):
+        return iter(('narrative_id',) + tuple(LiquidityPoolRegistry.ASSET_KEYS) + tuple(LiquidityPoolRegistry.COLUMNS))
+    
+    def __len__(self) -> int:
+        return len(LiquidityPoolRegistry.COLUMNS) + len(LiquidityPoolRegistry.ASSET_KEYS) + 1
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class LiquidityPoolRegistry(Mapping):
+    """Array-backed store of constant-product pools keyed by narrative id
+    
+    Reads as ``{narrative_id: pool}`` where each pool is a dict-like
+    PoolView, so existing ``pool['belief_reserves']`` access keeps working,
+    while batch swaps and quotes operate on the underlying columns. The
+    swap math runs on the given kernel backend (NumPy by default).
+    
+    Each pool trades a base asset (the narrative's belief, named after the
+    pool) against a quote asset, by default the pool's own counter-belief
+    ``'<id>:counter'``. Pools that share assets form the graph searched by
+    PoolArbitrageGraph. ``_revision`` counts writes per pool so consumers
+    can pick up exactly the pools that changed.
+    """
+    
+    COLUMNS = {
+        'belief_reserves': '_belief_reserves',
+        'counter_belief_reserves': '_counter_reserves',
+        'total_liquidity': '_total_liquidity',
+        'fee_rate': '_fee_rate',
+        'accumulated_fees': '_accumulated_fees',
+        'k_constant': '_k_constant',
+    }
+    
+    ASSET_KEYS = {
+        'base_asset': '_base_assets',
+        'quote_asset': '_quote_assets',
+    }
+    
+    def __init__(self, initial_capacity: int = 64, kernels=None):
+        self.kernels = kernels if kernels is not None else NumpyKernels()
+        for attr in self.COLUMNS.values():
+            setattr(self, attr, np.zeros(initial_capacity, dtype=np.float64))
+        self._ids: List[str] = []
+        self._slot_of: Dict[str, int] = {}
+        self._base_assets: List[str] = []
+        self._quote_assets: List[str] = []
+        self._revision = np.zeros(initial_capacity, dtype=np.int64)
+        self._liquidity_sum = 0.0  # running total of the total_liquidity column
+        
+    def _column(self, key: str) -> np.ndarray:
+        return getattr(self, self.COLUMNS[key])
+    
+    def __getitem__(self, narrative_id: str) -> PoolView:
+        return PoolView(self, self._slot_of[narrative_id])
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, narrative_id) -> bool:
+        return narrative_id in self._slot_of
+    
+    def create(self, narrative_id: str, initial_liquidity: float, fee_rate: float = 0.003,
+               quote_asset: Optional[str] = None, base_asset: Optional[str] = None) -> PoolView:
+        """Create (or reset) a pool with equal reserves on both sides"""
+        base_asset = base_asset or narrative_id
+        quote_asset = quote_asset or f"{narrative_id}:counter"
+        slot = self._slot_of.get(narrative_id)
+        if slot is None:
+            slot = len(self._ids)
+            if slot == len(self._belief_reserves):
+                for attr in list(self.COLUMNS.values()) + ['_revision']:
+                    column = getattr(self, attr)
+                    setattr(self, attr, np.concatenate([column, np.zeros(len(column), dtype=column.dtype)]))
+            self._ids.append(narrative_id)
+            self._slot_of[narrative_id] = slot
+            self._base_assets.append(base_asset)
+            self._quote_assets.append(quote_asset)
+        else:
+            self._base_assets[slot] = base_asset
+            self._quote_assets[slot] = quote_asset
+            
+        self._revision[slot] += 1
+        self._belief_reserves[slot] = initial_liquidity
+        self._counter_reserves[slot] = initial_liquidity
+        self._liquidity_sum += initial_liquidity * 2 - self._total_liquidity[slot]
+        self._total_liquidity[slot] = initial_liquidity * 2
+        self._fee_rate[slot] = fee_rate
+        self._accumulated_fees[slot] = 0.0
+        self._k_constant[slot] = initial_liquidity ** 2  # x * y = k
+        return PoolView(self, slot)
+    
+    def slots(self, narrative_ids) -> np.ndarray:
+        """Pool slots for narrative ids, -1 where no pool exists"""
+        return np.array([self._slot_of.get(nid, -1) for nid in narrative_ids], dtype=np.int64)
+    
+    def execute_swaps(self, narrative_ids, amounts, directions, mutate: bool = True) -> Dict[str, np.ndarray]:
+        """Apply an ordered vector of swaps across many pools in one call
+        
+        Swaps on the same pool are applied in input order. The batch runs
+        in rounds: round r applies the r-th swap of every pool at once,
+        so each round is a single vectorized step over distinct pools. With
+        ``mutate=False`` the same sequence is simulated on a copy of the
+        reserves and the registry is left untouched.
+        """
+        slots = self.slots(narrative_ids)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        is_buy = np.asarray(directions) == 'buy'
+        n = len(slots)
+        
+        received, fees, impacts, prices = (np.full(n, np.nan) for _ in range(4))
+        valid = slots >= 0
+        
+        x = self._belief_reserves if mutate else self._belief_reserves.copy()
+        y = self._counter_reserves if mutate else self._counter_reserves.copy()
+        accumulated = self._accumulated_fees if mutate else self._accumulated_fees.copy()
+        
+        swaps = np.flatnonzero(valid)
+        if len(swaps):
+            # Rank of each swap among earlier swaps on the same pool
+            by_pool = swaps[np.argsort(slots[swaps], kind='stable')]
+            sorted_slots = slots[by_pool]
+            group_start = np.r_[0, np.flatnonzero(np.diff(sorted_slots)) + 1]
+            group_sizes = np.diff(np.r_[group_start, len(by_pool)])
+            ranks = np.arange(len(by_pool)) - np.repeat(group_start, group_sizes)
+            
+            by_round = by_pool[np.lexsort((by_pool, ranks))]
+            round_sizes = np.bincount(ranks)
+            
+            start = 0
+            for size in round_sizes.tolist():
+                batch = by_round[start:start + size]
+                start += size
+                pool = slots[batch]
+                
+                new_x, new_y, got, fee, impact = self.kernels.constant_product_swap(
+                    x[pool], y[pool], self._k_constant[pool], self._fee_rate[pool],
+                    amounts[batch], is_buy[batch]
+                )
+                x[pool], y[pool] = new_x, new_y
+                accumulated[pool] += fee
+                if mutate:
+                    self._revision[pool] += 1
+                received[batch], fees[batch], impacts[batch] = got, fee, impact
+                prices[batch] = new_x / new_y
+                
+        return {
+            'valid': valid,
+            'executed_amount': amounts,
+            'received_amount': received,
+            'fee_paid': fees,
+            'price_impact': impacts,
+            'new_price': prices
+        }
+    
+    def quote_swaps(self, narrative_ids, amounts, directions) -> Dict[str, np.ndarray]:
+        """Evaluate many hypothetical swaps independently against current reserves
+        
+        Nothing is mutated and quotes do not affect each other, so this is one
+        vectorized pass regardless of how many quotes share a pool.
+        """
+        slots = self.slots(narrative_ids)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        is_buy = np.asarray(directions) == 'buy'
+        valid = slots >= 0
+        pool = np.where(valid, slots, 0)
+        
+        if len(self._ids) == 0:
+            nan = np.full(len(slots), np.nan)
+            return {'valid': valid, 'executed_amount': amounts, 'received_amount': nan,
+                    'fee_paid': nan, 'price_impact': nan, 'new_price': nan}
+        
+        new_x, new_y, received, fee, impact = self.kernels.constant_product_swap(
+            self._belief_reserves[pool], self._counter_reserves[pool],
+            self._k_constant[pool], self._fee_rate[pool], amounts, is_buy
+        )
+        masked = lambda values: np.where(valid, values, np.nan)
+        return {
+            'valid': valid,
+            'executed_amount': amounts,
+            'received_amount': masked(received),
+            'fee_paid': masked(fee),
+            'price_impact': masked(impact),
+            'new_price': masked(new_x / new_y)
+        }
+    
+    def to_columns(self) -> Dict[str, Any]:
+        """Copy of every pool as ``{'narrative_id': [...], column: array}``"""
+        n = len(self._ids)
+        return {'narrative_id': list(self._ids),
+                'base_asset': list(self._base_assets),
+                'quote_asset': list(self._quote_assets),
+                **{key: self._column(key)[:n].copy() for key in self.COLUMNS}}
+    
+    def load_columns(self, narrative_ids: List[str], columns: Dict[str, np.ndarray],
+                     base_assets: Optional[List[str]] = None, quote_assets: Optional[List[str]] = None):
+        """Bulk-create (or overwrite) pools from arrays keyed like COLUMNS"""
+        base_assets = base_assets or [None] * len(narrative_ids)
+        quote_assets = quote_assets or [None] * len(narrative_ids)
+        for narrative_id, base_asset, quote_asset in zip(narrative_ids, base_assets, quote_assets):
+            self.create(narrative_id, 0.0, quote_asset=quote_asset, base_asset=base_asset)
+        slots = self.slots(narrative_ids)
+        for key, values in columns.items():
+            self._column(key)[slots] = values
+        self._revision[slots] += 1
+        self._liquidity_sum = float(self._total_liquidity[:len(self._ids)].sum())
+    
+    def total_liquidity(self) -> float:
+        """Total liquidity across pools, maintained on every write"""
+        return float(self._liquidity_sum)
+
 class NarrativeVolatilityEngine:
     """Core engine for narrative market infrastructure"""
     
-    def __init__(self):
+    def __init__(self, history_length: int = 1000, nvx_history_path: Optional[str] = None,
+                 backend: str = 'numpy', precision: str = 'float64'):
+        # Numeric kernels: 'numpy', or 'jax' for jit-compiled versions (falls back to NumPy)
+        self.kernels = get_kernels(backend)
+        
+        # Columnar price history shared by every narrative; 'float32' halves its
+        # memory at the error bounds documented on PriceHistoryStore
+        if precision not in PRICE_PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.precision = precision
+        self.price_store = PriceHistoryStore(capacity=history_length, dtype=PRICE_PRECISIONS[precision])
+        self._slot_ids: Dict[int, str] = {}
+        
         # Market data structures
-        self.narrative_assets: Dict[str, NarrativeAsset] = {}
-        self.order_book: Dict[str, List[Dict]] = defaultdict(list)
-        self.liquidity_pools: Dict[str, Dict] = {}
-        self.volatility_index_history = deque(maxlen=10000)
+        self.narrative_assets: Dict[str, NarrativeAsset] = NarrativeAssetRegistry(self)
+        self.order_book: Dict[str, NarrativeOrderBook] = {}
+        self._order_ids = count(1)
+        self.liquidity_pools: Dict[str, PoolView] = LiquidityPoolRegistry(kernels=self.kernels)
+        self.pool_graph = PoolArbitrageGraph(self.liquidity_pools)
+        # Memory-mapped on disk when a path is given, otherwise the latest 10k points in memory
+        self.volatility_index_history = NVXTimeSeries(
+            nvx_history_path, max_records=None if nvx_history_path else 10000
+        )
+        self._nvx_cache: Optional[Tuple[int, float]] = None  # (market_version, nvx)
+        self._universe_cache: Optional[Tuple[int, List[str], np.ndarray]] = None
+        self._last_arbitrage_scan: Optional[Tuple[int, datetime, List[Dict[str, Any]], Optional[int]]] = None
+        self._snapshot_cache: Optional[MarketSnapshot] = None
+        self._snapshot_top_k: Optional[int] = None
+        self._subscribers: List[Callable[[NarrativeEvent], None]] = []
+        self.rating_transitions: deque = deque(maxlen=100000)  # (narrative_id, previous, new)
         
         # Tensor framework components
         self.belief_propagation_tensor = None
@@ -53,6 +1093,18 @@ class NarrativeVolatilityEngine:
         self.LIQUIDITY_DEPTH = 100  # order book depth
         self.COHERENCE_DECAY_RATE = 0.95
         self.ARBITRAGE_THRESHOLD = 0.02  # 2% spread
+        self.RISK_FREE_RATE = 0.05  # narrative decay rate
+        self.CORRELATION_WINDOW = 30  # prices compared per pair
+        self.CORRELATION_THRESHOLD = 0.7
+        self.SCAN_BLOCK_ELEMENTS = 4_000_000  # correlation cells held per scan block
+        self.STREAMING_CORRELATION_LIMIT = 4096  # max universe for the n x n running sums
+        self.APPROXIMATE_SCAN_LIMIT: Optional[int] = None  # universes above this use LSH (None: never)
+        self.APPROXIMATE_SCAN_RECALL = 0.95  # expected recall of pairs at the threshold
+        
+        # Running correlation sums, refreshed lazily from the price store
+        self.correlation_tracker = RollingCorrelationTracker(
+            self.price_store, window=self.CORRELATION_WINDOW, resync_interval=history_length
+        )
         
         # Reality credit rating thresholds
         self.RATING_THRESHOLDS = {
@@ -66,12 +1118,130 @@ class NarrativeVolatilityEngine:
             'D': 0.0  # Default - narrative collapsed
         }
         
+    def save_snapshot(self, directory: str) -> Dict[str, Any]:
+        """Write narratives, price histories, pools and NVX history to ``directory``
+        
+        See narrative_snapshot.write_snapshot for the layout. Histories are
+        copied straight out of the price store, one gather per distinct
+        history length. Returns the manifest.
+        """
+        narratives = list(self.narrative_assets.values())
+        slots = np.array([n.price_history.slot for n in narratives], dtype=np.int64)
+        lengths = self.price_store._length[slots].astype(np.int64)
+        offsets = np.cumsum(lengths) - lengths
+        
+        prices = np.empty(int(lengths.sum()), dtype=np.float64)
+        for length in np.unique(lengths[lengths > 0]).tolist():
+            rows = np.flatnonzero(lengths == length)
+            prices[offsets[rows, None] + np.arange(length)] = self.price_store.windows(slots[rows], length)
+            
+        table = pd.DataFrame({
+            'id': [n.id for n in narratives],
+            'content': [n.content for n in narratives],
+            'origin_platform': [n.origin_platform for n in narratives],
+            'timestamp': self.price_store.field_values('timestamp', slots).astype('datetime64[ns]'),
+            **{name: self.price_store.field_values(name, slots)
+               for name in ('belief_penetration', 'volatility_30d', 'liquidity_score', 'mutation_rate')},
+            'coherence_rating': [n.coherence_rating for n in narratives],
+            'history_offset': offsets,
+            'history_length': lengths
+        })
+        
+        return write_snapshot(
+            directory, table, prices,
+            pools=pd.DataFrame(self.liquidity_pools.to_columns()),
+            nvx=pd.DataFrame(self.volatility_index_history.to_dict()),
+            metadata={'history_capacity': self.price_store.capacity, 'backend': self.kernels.name,
+                      'precision': self.precision}
+        )
+    
+    @classmethod
+    def load_snapshot(cls, directory: str, **engine_kwargs) -> 'NarrativeVolatilityEngine':
+        """Build an engine from a save_snapshot directory
+        
+        ``engine_kwargs`` go to the constructor; ``history_length`` and
+        ``precision`` default to the snapshot's. NVX points are only restored into an empty
+        series, so reopening a persistent nvx_history_path keeps its own.
+        """
+        snapshot = read_snapshot(directory, mmap_prices=False)
+        engine_kwargs.setdefault('history_length', snapshot['manifest']['history_capacity'])
+        engine_kwargs.setdefault('precision', snapshot['manifest'].get('precision', 'float64'))
+        engine = cls(**engine_kwargs)
+        
+        table = snapshot['narratives']
+        prices = snapshot['prices']
+        columns = [table[name].tolist() for name in (
+            'id', 'content', 'origin_platform', 'belief_penetration', 'volatility_30d',
+            'liquidity_score', 'coherence_rating', 'mutation_rate'
+        )]
+        timestamps = table['timestamp'].dt.to_pydatetime().tolist()
+        
+        # Fill the price store in bulk, then attach assets already bound to their rows
+        store = engine.price_store
+        slots = np.array([store.allocate() for _ in range(len(table))], dtype=np.int64)
+        store.extend_empty(slots, prices, table['history_offset'].to_numpy(), table['history_length'].to_numpy())
+        for name in PriceHistoryStore.MIRRORED_FIELDS:
+            store.set_field_values(name, slots, table[name].tolist())
+            
+        assets = engine.narrative_assets
+        for (narrative_id, content, platform, belief, volatility, liquidity, rating, mutation,
+             slot), timestamp in zip(zip(*columns, slots.tolist()), timestamps):
+            engine._slot_ids[slot] = narrative_id
+            assets[narrative_id] = NarrativeAsset(
+                id=narrative_id, content=content, origin_platform=platform, timestamp=timestamp,
+                belief_penetration=belief, volatility_30d=volatility, liquidity_score=liquidity,
+                coherence_rating=rating, mutation_rate=mutation,
+                price_history=PriceHistoryView(store, slot)
+            )
+            
+        pools = snapshot['pools']
+        engine.liquidity_pools.load_columns(
+            pools['narrative_id'].tolist(),
+            {key: pools[key].to_numpy() for key in LiquidityPoolRegistry.COLUMNS},
+            *(pools[key].tolist() if key in pools else None for key in LiquidityPoolRegistry.ASSET_KEYS)
+        )
+        
+        nvx = snapshot['nvx']
+        if len(engine.volatility_index_history) == 0:
+            engine.volatility_index_history.extend(
+                nvx['timestamp_ns'].to_numpy(), nvx['nvx'].to_numpy(), nvx['component_count'].to_numpy()
+            )
+        return engine
+    
+    def _bind_narrative(self, narrative: NarrativeAsset):
+        """Move a narrative's price history into the shared store"""
+        history = narrative.price_history
+        if isinstance(history, PriceHistoryView) and history.store is self.price_store:
+            return
+            
+        slot = self.price_store.allocate()
+        self.price_store.extend(slot, price_window(history))
+        narrative.price_history = PriceHistoryView(self.price_store, slot)
+        self._slot_ids[slot] = narrative.id
+        for name in PriceHistoryStore.MIRRORED_FIELDS:
+            self.price_store.set_field(slot, name, getattr(narrative, name))
+    
+    def _unbind_narrative(self, narrative: NarrativeAsset):
+        """Hand a narrative its history back as a standalone deque"""
+        history = narrative.price_history
+        if not (isinstance(history, PriceHistoryView) and history.store is self.price_store):
+            return
+            
+        narrative.price_history = deque(history.values().tolist(), maxlen=self.price_store.capacity)
+        self.price_store.release(history.slot)
+        self._slot_ids.pop(history.slot, None)
+    
     def calculate_narrative_volatility(self, narrative: NarrativeAsset) -> float:
         """Calculate 30-day rolling volatility for narrative belief"""
+        history = narrative.price_history
+        if isinstance(history, PriceHistoryView) and history.store is self.price_store:
+            # Streaming moments are maintained on every append
+            return self.price_store.volatility(history.slot)
+            
         if len(narrative.price_history) < 2:
             return 0.0
             
-        prices = np.array(list(narrative.price_history))
+        prices = price_window(narrative.price_history)
         returns = np.diff(np.log(prices + 1e-10))  # Log returns
         
         if len(returns) < 2:
@@ -81,125 +1251,377 @@ class NarrativeVolatilityEngine:
         volatility = np.std(returns) * np.sqrt(252)
         return volatility
     
+    def recompute_volatilities(self) -> Dict[str, float]:
+        """Exact volatility of every bound narrative from its full history
+        
+        Audits the streaming moments: narratives are grouped by history
+        length and each group is one rolling_volatility kernel call.
+        """
+        slots = self.price_store.active_slots()
+        lengths = self.price_store._length[slots]
+        result = {}
+        for length in np.unique(lengths).tolist():
+            group = slots[lengths == length]
+            vols = self.kernels.rolling_volatility(self.price_store.windows(group, length))
+            result.update(zip((self._slot_ids[slot] for slot in group.tolist()), vols.tolist()))
+        return result
+    
     def calculate_belief_greeks(self, derivative: BeliefDerivative) -> Dict[str, float]:
         """Calculate option Greeks for belief derivatives"""
         # Simplified Black-Scholes for belief options
-        S = self.narrative_assets[derivative.underlying_narrative_id].belief_penetration
-        K = derivative.strike_belief
-        T = (derivative.expiry - datetime.now()).days / 365.0
-        r = 0.05  # Risk-free rate (narrative decay rate)
-        sigma = derivative.implied_volatility
-        
-        # Prevent division by zero
-        if T <= 0 or sigma <= 0:
-            return {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-        
-        from scipy.stats import norm
-        
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
+        greeks = belief_greeks_batch(
+            spot=self.narrative_assets[derivative.underlying_narrative_id].belief_penetration,
+            strike=derivative.strike_belief,
+            expiry_years=(derivative.expiry - datetime.now()).days / 365.0,
+            sigma=derivative.implied_volatility,
+            is_call=derivative.contract_type == 'call',
+            rate=self.RISK_FREE_RATE
+        )
+        return {name: float(value) for name, value in greeks.items()}
+    
+    def calculate_book_greeks(self, derivatives: List[BeliefDerivative],
+                              quantities: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Vectorized Greeks for a book of belief derivatives
         
-        # Greeks
-        if derivative.contract_type == 'call':
-            delta = norm.cdf(d1)
-            theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) - r * K * np.exp(-r * T) * norm.cdf(d2)) / 365
-        else:  # put
-            delta = norm.cdf(d1) - 1
-            theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) + r * K * np.exp(-r * T) * norm.cdf(-d2)) / 365
+        Returns per-contract Greek arrays (in input order) plus portfolio
+        delta/gamma/vega aggregated per underlying narrative.
+        """
+        if not derivatives:
+            return {'greeks': {name: np.zeros(0) for name in GREEK_NAMES}, 'by_underlying': {}}
             
-        gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        vega = S * norm.pdf(d1) * np.sqrt(T) / 100
-        rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100 if derivative.contract_type == 'call' else -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
+        underlying_ids, codes, spots = self._book_underlyings(derivatives)
+        
+        greeks = self.kernels.belief_greeks(
+            spot=spots[codes],
+            strike=np.array([d.strike_belief for d in derivatives], dtype=np.float64),
+            expiry_years=years_to_expiry([d.expiry for d in derivatives]),
+            sigma=np.array([d.implied_volatility for d in derivatives], dtype=np.float64),
+            is_call=np.array([d.contract_type == 'call' for d in derivatives]),
+            rate=self.RISK_FREE_RATE
+        )
         
         return {
-            'delta': delta,
-            'gamma': gamma,
-            'theta': theta,
-            'vega': vega,
-            'rho': rho
+            'greeks': greeks,
+            'by_underlying': self._aggregate_by_underlying(underlying_ids, codes, greeks, quantities)
         }
     
-    def create_liquidity_pool(self, narrative_id: str, initial_liquidity: float) -> Dict[str, Any]:
-        """Create automated market maker for narrative liquidity"""
-        pool = {
-            'narrative_id': narrative_id,
-            'belief_reserves': initial_liquidity,
-            'counter_belief_reserves': initial_liquidity,
-            'total_liquidity': initial_liquidity * 2,
-            'fee_rate': 0.003,  # 0.3% fee
-            'accumulated_fees': 0.0,
-            'k_constant': initial_liquidity ** 2  # x * y = k
+    def _book_underlyings(self, derivatives: List[BeliefDerivative]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Distinct underlying ids, each contract's index into them, and their spots"""
+        underlying_ids, codes = np.unique(
+            [d.underlying_narrative_id for d in derivatives], return_inverse=True
+        )
+        spots = np.array([self.narrative_assets[nid].belief_penetration for nid in underlying_ids])
+        return underlying_ids, codes, spots
+    
+    @staticmethod
+    def _aggregate_by_underlying(underlying_ids: np.ndarray, codes: np.ndarray, values: Dict[str, np.ndarray],
+                                 quantities: Optional[np.ndarray] = None,
+                                 names: Tuple[str, ...] = ('delta', 'gamma', 'vega')) -> Dict[str, Dict[str, float]]:
+        """Quantity-weighted sums of per-contract values for each underlying"""
+        weights = np.ones(len(codes)) if quantities is None else np.asarray(quantities, dtype=np.float64)
+        totals = {name: np.bincount(codes, weights=values[name] * weights, minlength=len(underlying_ids))
+                  for name in names}
+        return {
+            nid: {name: float(totals[name][i]) for name in names}
+            for i, nid in enumerate(underlying_ids.tolist())
         }
+    
+    def price_book_monte_carlo(self, derivatives: List[BeliefDerivative],
+                               quantities: Optional[np.ndarray] = None, n_paths: int = 10_000,
+                               n_steps: int = 24, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Bounded-belief Monte Carlo prices and bump Greeks for a whole book
+        
+        Unlike calculate_book_greeks this respects belief's [0, 1] bounds and
+        also values futures and swaps; see monte_carlo_belief_prices for the
+        model. Returns per-contract 'price', 'std_error' and 'greeks' arrays
+        plus value/delta/gamma/vega aggregated per underlying. Pass the same
+        ``seed`` to reprice against common random numbers.
+        """
+        if not derivatives:
+            return {'price': np.zeros(0), 'std_error': np.zeros(0),
+                    'greeks': {name: np.zeros(0) for name in GREEK_NAMES}, 'by_underlying': {}}
+            
+        underlying_ids, codes, spots = self._book_underlyings(derivatives)
+        result = monte_carlo_belief_prices(
+            spot=spots[codes],
+            strike=np.array([d.strike_belief for d in derivatives], dtype=np.float64),
+            expiry_years=years_to_expiry([d.expiry for d in derivatives]),
+            sigma=np.array([d.implied_volatility for d in derivatives], dtype=np.float64),
+            contract_type=[d.contract_type for d in derivatives],
+            underlying=codes,
+            rate=self.RISK_FREE_RATE,
+            n_paths=n_paths,
+            n_steps=n_steps,
+            seed=seed
+        )
         
-        self.liquidity_pools[narrative_id] = pool
-        return pool
+        result['by_underlying'] = self._aggregate_by_underlying(
+            underlying_ids, codes, {'value': result['price'], **result['greeks']}, quantities,
+            names=('value', 'delta', 'gamma', 'vega')
+        )
+        return result
+    
+    def calibrate_implied_volatility(self, derivatives: List[BeliefDerivative]) -> np.ndarray:
+        """Solve implied vols from each contract's premium and store them
+        
+        Calls are priced as calls, everything else as puts (as in the
+        Greeks). Contracts whose premium has no solution keep their
+        previous implied_volatility and report NaN.
+        """
+        if not derivatives:
+            return np.zeros(0)
+            
+        _, codes, spots = self._book_underlyings(derivatives)
+        
+        vols = implied_volatility_batch(
+            premium=np.array([d.premium for d in derivatives], dtype=np.float64),
+            spot=spots[codes],
+            strike=np.array([d.strike_belief for d in derivatives], dtype=np.float64),
+            expiry_years=years_to_expiry([d.expiry for d in derivatives]),
+            is_call=np.array([d.contract_type == 'call' for d in derivatives]),
+            rate=self.RISK_FREE_RATE
+        )
+        
+        for derivative, vol in zip(derivatives, vols.tolist()):
+            if not np.isnan(vol):
+                derivative.implied_volatility = vol
+                
+        return vols
+    
+    def create_liquidity_pool(self, narrative_id: str, initial_liquidity: float,
+                              quote_asset: Optional[str] = None, base_asset: Optional[str] = None) -> Dict[str, Any]:
+        """Create automated market maker for narrative liquidity
+        
+        By default the pool trades the narrative's belief against its own
+        counter-belief. Naming a shared ``quote_asset`` (or another
+        narrative as ``base_asset``/``quote_asset``) links pools into the
+        graph searched by identify_pool_arbitrage_cycles.
+        """
+        return self.liquidity_pools.create(narrative_id, initial_liquidity, fee_rate=0.003,  # 0.3% fee
+                                           quote_asset=quote_asset, base_asset=base_asset)
     
     def execute_belief_swap(self, narrative_id: str, belief_amount: float, 
                           direction: str = 'buy') -> Dict[str, Any]:
         """Execute swap in narrative liquidity pool"""
-        pool = self.liquidity_pools.get(narrative_id)
-        if not pool:
+        if narrative_id not in self.liquidity_pools:
             return {'error': 'No liquidity pool found'}
             
-        x = pool['belief_reserves']
-        y = pool['counter_belief_reserves']
-        k = pool['k_constant']
-        
-        if direction == 'buy':
-            # Buying belief with counter-belief
-            dy = belief_amount
-            dx = (k / (y + dy)) - x
-            fee = abs(dx) * pool['fee_rate']
-            
-            pool['belief_reserves'] = x + dx - fee
-            pool['counter_belief_reserves'] = y + dy
-            price_impact = abs(dx) / x
-            
-        else:  # sell
-            # Selling belief for counter-belief
-            dx = belief_amount
-            dy = (k / (x + dx)) - y
-            fee = abs(dy) * pool['fee_rate']
-            
-            pool['belief_reserves'] = x + dx
-            pool['counter_belief_reserves'] = y + dy - fee
-            price_impact = abs(dy) / y
-            
-        pool['accumulated_fees'] += fee
-        
+        result = self.liquidity_pools.execute_swaps([narrative_id], [belief_amount], [direction])
         return {
             'executed_amount': belief_amount,
-            'received_amount': abs(dx) if direction == 'buy' else abs(dy),
-            'fee_paid': fee,
-            'price_impact': price_impact,
-            'new_price': pool['belief_reserves'] / pool['counter_belief_reserves']
+            'received_amount': float(result['received_amount'][0]),
+            'fee_paid': float(result['fee_paid'][0]),
+            'price_impact': float(result['price_impact'][0]),
+            'new_price': float(result['new_price'][0])
+        }
+    
+    def identify_pool_arbitrage_cycles(self, max_cycles: int = 10) -> List[Dict[str, Any]]:
+        """Profitable multi-leg cycles through the liquidity pools
+        
+        Each cycle lists its assets, pools, directions ('sell' or 'buy'
+        belief) and marginal profit_rate; size trades with
+        ``self.pool_graph.simulate_cycle``. Only pools changed since the
+        last call are re-searched when the market was cycle-free.
+        """
+        return self.pool_graph.find_cycles(max_cycles)
+    
+    def execute_belief_swaps(self, narrative_ids: List[str], amounts, directions) -> Dict[str, np.ndarray]:
+        """Apply an ordered batch of swaps; see LiquidityPoolRegistry.execute_swaps"""
+        return self.liquidity_pools.execute_swaps(narrative_ids, amounts, directions)
+    
+    def quote_belief_swaps(self, narrative_ids: List[str], amounts, directions) -> Dict[str, np.ndarray]:
+        """Non-mutating, independent swap quotes for the arbitrage layer"""
+        return self.liquidity_pools.quote_swaps(narrative_ids, amounts, directions)
+    
+    @property
+    def market_version(self) -> int:
+        """Counter bumped on every price append or mirrored field write"""
+        return self.price_store.version
+    
+    def get_order_book(self, narrative_id: str) -> NarrativeOrderBook:
+        """Order book for a narrative, created on first use"""
+        book = self.order_book.get(narrative_id)
+        if book is None:
+            book = NarrativeOrderBook(narrative_id, depth=self.LIQUIDITY_DEPTH)
+            self.order_book[narrative_id] = book
+        return book
+    
+    def _order_route(self, narrative_id: str, route_to_pool: bool) -> Optional[PoolRoute]:
+        return PoolRoute(self, narrative_id) if route_to_pool and narrative_id in self.liquidity_pools else None
+    
+    @staticmethod
+    def _order_result(order: LimitOrder, fills: List[Fill]) -> Dict[str, Any]:
+        return {
+            'order_id': order.order_id,
+            'status': order.status,
+            'filled': order.quantity - order.remaining,
+            'remaining': order.remaining,
+            'fills': fills
         }
     
+    def submit_order(self, narrative_id: str, side: str, price: float, quantity: float,
+                     route_to_pool: bool = True) -> Dict[str, Any]:
+        """Submit a limit order, matching against the book and the AMM pool
+        
+        Prices are counter-belief per belief. With ``route_to_pool`` the
+        narrative's liquidity pool fills whenever it beats resting orders.
+        Statuses are those of NarrativeOrderBook.submit.
+        """
+        order = LimitOrder(next(self._order_ids), narrative_id, side, price, quantity)
+        fills = self.get_order_book(narrative_id).submit(order, self._order_route(narrative_id, route_to_pool))
+        return self._order_result(order, fills)
+    
+    def submit_orders(self, orders: List[Dict[str, Any]], route_to_pool: bool = True) -> List[Dict[str, Any]]:
+        """Batch submission in arrival order; each dict holds submit_order kwargs
+        
+        Orders are grouped per narrative and matched with
+        NarrativeOrderBook.submit_batch, keeping arrival order within each
+        book; books and their pools are independent, so the outcome equals
+        submitting one by one. Every order is validated before any is
+        matched. Results come back in input order, each as of its own
+        submission.
+        """
+        limit_orders = [LimitOrder(next(self._order_ids), order['narrative_id'], order['side'],
+                                   order['price'], order['quantity']) for order in orders]
+        for order in limit_orders:
+            NarrativeOrderBook.validate(order)
+            
+        by_narrative: Dict[str, List[LimitOrder]] = {}
+        for order in limit_orders:
+            by_narrative.setdefault(order.narrative_id, []).append(order)
+            
+        results: Dict[int, Dict[str, Any]] = {}
+        record = lambda order, fills: results.__setitem__(order.order_id, self._order_result(order, fills))
+        for narrative_id, batch in by_narrative.items():
+            route = self._order_route(narrative_id, route_to_pool)
+            self.get_order_book(narrative_id).submit_batch(batch, route, on_submitted=record)
+        return [results[order.order_id] for order in limit_orders]
+    
+    def cancel_order(self, narrative_id: str, order_id: int) -> bool:
+        """Cancel a resting order"""
+        book = self.order_book.get(narrative_id)
+        return book.cancel(order_id) if book else False
+    
     def calculate_nvx_index(self) -> float:
         """Calculate Narrative Volatility Index (NVX)"""
         if not self.narrative_assets:
             return 0.0
             
-        # Weighted average of narrative volatilities
-        total_weight = 0
-        weighted_vol = 0
-        
-        for narrative in self.narrative_assets.values():
-            weight = narrative.belief_penetration * narrative.liquidity_score
-            vol = self.calculate_narrative_volatility(narrative)
-            weighted_vol += weight * vol
-            total_weight += weight
+        # Repeated calls within one market state are free
+        if self._nvx_cache is not None and self._nvx_cache[0] == self.market_version:
+            return self._nvx_cache[1]
             
-        nvx = (weighted_vol / total_weight) * 100 if total_weight > 0 else 0.0
+        # Weighted average of narrative volatilities, one pass over the columns
+        slots = self.price_store.active_slots()
+        weights = np.multiply(self.price_store.field_values('belief_penetration', slots),
+                              self.price_store.field_values('liquidity_score', slots), dtype=np.float64)
+        vols = self.price_store.volatilities(slots)
         
-        self.volatility_index_history.append({
-            'timestamp': datetime.now(),
-            'nvx': nvx,
-            'component_count': len(self.narrative_assets)
-        })
+        total_weight = weights.sum()
+        nvx = float(weights @ vols / total_weight) * 100 if total_weight > 0 else 0.0
+        self._nvx_cache = (self.market_version, nvx)
+        
+        self.volatility_index_history.append(nvx, len(self.narrative_assets))
         
         return nvx
     
+    def _rating_lookup(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Ascending thresholds and the rating code each one maps to"""
+        ordered = sorted(self.RATING_THRESHOLDS.items(), key=lambda item: item[1])
+        thresholds = np.array([threshold for _, threshold in ordered])
+        codes = np.array([RATING_CODES[rating] for rating, _ in ordered], dtype=np.int8)
+        return thresholds, codes
+    
+    def ratings_for_scores(self, scores: np.ndarray) -> np.ndarray:
+        """Map coherence scores to rating codes with one searchsorted"""
+        thresholds, codes = self._rating_lookup()
+        position = np.searchsorted(thresholds, np.nan_to_num(scores, nan=-np.inf), side='right') - 1
+        # Below the lowest threshold falls through to default
+        return np.where(position >= 0, codes[np.maximum(position, 0)], RATING_CODES['D']).astype(np.int8)
+    
+    def rate_all_narratives(self) -> List[Tuple[str, str, str]]:
+        """Batch-rate every narrative and write changed ratings back
+        
+        Returns the compact list of (narrative_id, previous, new) transitions
+        from this pass; they are also queued on ``rating_transitions`` for
+        polling consumers and published to subscribers.
+        """
+        store = self.price_store
+        slots = store.active_slots()
+        scores = coherence_scores_batch(store._volatility[slots], store._liquidity[slots], store._mutation[slots])
+        new_codes = self.ratings_for_scores(scores)
+        
+        changed = np.flatnonzero(new_codes != store._rating[slots])
+        if len(changed) == 0:
+            return []
+            
+        transitions = []
+        for slot, old_code, new_code in zip(slots[changed].tolist(), store._rating[slots[changed]].tolist(),
+                                            new_codes[changed].tolist()):
+            narrative = self.narrative_assets[self._slot_ids[slot]]
+            previous = narrative.coherence_rating
+            object.__setattr__(narrative, 'coherence_rating', RATING_SCALE[new_code])
+            transitions.append((narrative.id, previous, RATING_SCALE[new_code]))
+            
+        store.set_field_values('coherence_rating', slots[changed], new_codes[changed])
+        self.rating_transitions.extend(transitions)
+        for narrative_id, previous, rating in transitions if self._subscribers else ():
+            self._publish(NarrativeEvent('rating', narrative_id, rating, previous))
+        return transitions
+    
+    def refresh_narrative_metrics(self) -> List[Tuple[str, str, str]]:
+        """Bulk-update volatility_30d from the streaming moments, then re-rate"""
+        store = self.price_store
+        slots = store.active_slots()
+        vols = store.volatilities(slots)
+        store.set_field_values('volatility_30d', slots, vols)
+        
+        for slot, vol in zip(slots.tolist(), vols.tolist()):
+            object.__setattr__(self.narrative_assets[self._slot_ids[slot]], 'volatility_30d', vol)
+            
+        return self.rate_all_narratives()
+    
+    def pop_rating_transitions(self) -> List[Tuple[str, str, str]]:
+        """Drain queued rating transitions"""
+        transitions = list(self.rating_transitions)
+        self.rating_transitions.clear()
+        return transitions
+    
+    def subscribe(self, callback: Callable[[NarrativeEvent], None]) -> Callable[[NarrativeEvent], None]:
+        """Call ``callback`` synchronously with every NarrativeEvent
+        
+        Events are price appends, belief writes and rating changes of single
+        narratives, plus the transitions of rate_all_narratives. Bulk
+        column writes (snapshot loads, batch volatility refreshes) are not
+        published. With no subscribers the store runs without a hook.
+        """
+        self._subscribers.append(callback)
+        self.price_store.observer = self._on_store_write
+        return callback
+    
+    def unsubscribe(self, callback: Callable[[NarrativeEvent], None]):
+        self._subscribers.remove(callback)
+        if not self._subscribers:
+            self.price_store.observer = None
+    
+    def _publish(self, event: NarrativeEvent):
+        for callback in list(self._subscribers):
+            callback(event)
+    
+    def _on_store_write(self, slot: int, name: str, value, previous):
+        kind = EVENT_KINDS.get(name)
+        narrative_id = self._slot_ids.get(slot)
+        if kind is None or narrative_id is None:
+            return
+        if kind == 'rating':
+            value = RATING_SCALE[value] if value >= 0 else None
+            previous = RATING_SCALE[previous] if previous >= 0 else None
+            if value == previous:
+                return
+        elif previous is not None:
+            previous = float(previous)
+        self._publish(NarrativeEvent(kind, narrative_id, float(value) if kind != 'rating' else value, previous))
+    
     def rate_narrative_coherence(self, narrative: NarrativeAsset) -> str:
         """Assign reality credit rating to narrative"""
         coherence_score = self.calculate_coherence_score(narrative)
@@ -219,38 +1641,202 @@ class NarrativeVolatilityEngine:
         coherence = (vol_factor * liquidity_factor * mutation_factor) ** (1/3)
         return min(coherence, 1.0)
     
-    def identify_arbitrage_opportunities(self) -> List[Dict[str, Any]]:
-        """Identify cross-narrative arbitrage opportunities"""
-        opportunities = []
+    def _correlation_universe(self) -> Tuple[List[str], np.ndarray]:
+        """Ids and store slots of narratives with a full correlation window"""
+        version = self.market_version
+        if self._universe_cache is None or self._universe_cache[0] != version:
+            slots = self.price_store.eligible_slots(self.CORRELATION_WINDOW)
+            ids = [self._slot_ids[slot] for slot in slots.tolist()]
+            self._universe_cache = (version, ids, slots)
+        return self._universe_cache[1], self._universe_cache[2]
+    
+    def _standardized_windows(self, slots: np.ndarray) -> np.ndarray:
+        """Centered, unit-norm price windows so row dot products are correlations"""
+        windows = self.price_store.windows(slots, self.CORRELATION_WINDOW).astype(np.float64)
+        centered = windows - windows.mean(axis=1, keepdims=True)
+        norms = np.sqrt((centered ** 2).sum(axis=1, keepdims=True))
+        # Flat windows have undefined correlation; zero rows make it 0 like the scalar path
+        return np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 0)
+    
+    def identify_arbitrage_opportunities(self, top_k: Optional[int] = None,
+                                         approximate: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Identify cross-narrative arbitrage opportunities
         
-        narratives = list(self.narrative_assets.values())
-        for i in range(len(narratives)):
-            for j in range(i + 1, len(narratives)):
-                n1, n2 = narratives[i], narratives[j]
+        With ``approximate`` (by default, universes larger than
+        APPROXIMATE_SCAN_LIMIT) correlated pairs are found by SimHash LSH
+        instead of the O(n^2) matrix scan; see _scan_approximate. The
+        result is kept as the last scan, which generate_market_report
+        serves instead of rescanning.
+        """
+        if approximate is None:
+            limit = self.APPROXIMATE_SCAN_LIMIT
+            approximate = limit is not None and len(self._correlation_universe()[0]) > limit
+        scan = self._scan_approximate if approximate else self._scan_arbitrage_opportunities
+        opportunities = scan(top_k)
+        self._last_arbitrage_scan = (self.market_version, datetime.now(), opportunities, top_k)
+        return opportunities
+    
+    def market_snapshot(self, top_k: Optional[int] = None) -> MarketSnapshot:
+        """Immutable snapshot of NVX, per-narrative columns and the arbitrage scan
+        
+        Computed once per market version: later calls at the same version
+        return the same object, and a scan already run at this version
+        (with the same ``top_k``) is reused rather than repeated.
+        """
+        version = self.market_version
+        cached = self._snapshot_cache
+        if cached is not None and cached.version == version and self._snapshot_top_k == top_k:
+            return cached
+            
+        nvx = self.calculate_nvx_index()
+        last = self._last_arbitrage_scan
+        if last is not None and last[0] == version and last[3] == top_k:
+            opportunities = last[2]
+        else:
+            opportunities = self.identify_arbitrage_opportunities(top_k)
+            
+        store = self.price_store
+        slots = store.active_slots()
+        ids = tuple(self._slot_ids[slot] for slot in slots.tolist())
+        snapshot = MarketSnapshot(
+            version=version,
+            timestamp=datetime.now(),
+            nvx=nvx,
+            ids=ids,
+            beliefs=_read_only(store.field_values('belief_penetration', slots)),
+            volatilities=_read_only(store.field_values('volatility_30d', slots)),
+            liquidity=_read_only(store.field_values('liquidity_score', slots)),
+            rating_codes=_read_only(store.field_values('coherence_rating', slots)),
+            arbitrage_opportunities=tuple(MappingProxyType(dict(o)) for o in opportunities),
+            index=MappingProxyType({narrative_id: row for row, narrative_id in enumerate(ids)})
+        )
+        self._snapshot_cache, self._snapshot_top_k = snapshot, top_k
+        return snapshot
+    
+    def _scan_arbitrage_opportunities(self, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Blocked scan behind identify_arbitrage_opportunities
+        
+        The full correlation matrix is computed block by block over the stacked
+        price windows and thresholded together with the belief spread matrix.
+        Only ``top_k`` opportunities (all when None) are kept between blocks.
+        """
+        ids, slots = self._correlation_universe()
+        count = len(ids)
+        if count < 2:
+            return []
+            
+        if count <= self.STREAMING_CORRELATION_LIMIT:
+            self.correlation_tracker.refresh(slots)
+            block_correlation = self.correlation_tracker.correlation_rows
+        else:
+            z = self._standardized_windows(slots)
+            block_correlation = lambda start, stop, column_start: self.kernels.correlation_block(
+                z[start:stop], z[column_start:])
+            
+        beliefs = self.price_store.field_values('belief_penetration', slots)
+        liquidity = self.price_store.field_values('liquidity_score', slots)
+        
+        rows_per_block = max(1, self.SCAN_BLOCK_ELEMENTS // count)
+        pair_i, pair_j, pair_corr, pair_spread, pair_profit = [], [], [], [], []
+        kept = 0
+        
+        for start in range(0, count, rows_per_block):
+            stop = min(start + rows_per_block, count)
+            
+            # Upper triangle only: column offset ``start`` keeps j >= i
+            correlation = block_correlation(start, stop, start)
+            spread = np.abs(beliefs[start:stop, None] - beliefs[None, start:])
+            mask = np.triu((correlation > self.CORRELATION_THRESHOLD) &
+                           (spread > self.ARBITRAGE_THRESHOLD), k=1)
+            
+            rows, cols = np.nonzero(mask)
+            if len(rows) == 0:
+                continue
                 
-                # Check for correlated narratives with price divergence
-                correlation = self.calculate_narrative_correlation(n1, n2)
-                if correlation > 0.7:  # Highly correlated
-                    price_spread = abs(n1.belief_penetration - n2.belief_penetration)
-                    
-                    if price_spread > self.ARBITRAGE_THRESHOLD:
-                        opportunities.append({
-                            'narrative_1': n1.id,
-                            'narrative_2': n2.id,
-                            'correlation': correlation,
-                            'spread': price_spread,
-                            'expected_profit': price_spread * min(n1.liquidity_score, n2.liquidity_score)
-                        })
-                        
-        return sorted(opportunities, key=lambda x: x['expected_profit'], reverse=True)
+            i, j = rows + start, cols + start
+            profit = spread[rows, cols] * np.minimum(liquidity[i], liquidity[j])
+            pair_i.append(i)
+            pair_j.append(j)
+            pair_corr.append(correlation[rows, cols])
+            pair_spread.append(spread[rows, cols])
+            pair_profit.append(profit)
+            kept += len(rows)
+            
+            # Bound memory: collapse candidates to the current top-k
+            if top_k is not None and kept > 2 * top_k:
+                merged = [np.concatenate(a) for a in (pair_i, pair_j, pair_corr, pair_spread, pair_profit)]
+                best = np.argpartition(-merged[4], top_k - 1)[:top_k]
+                pair_i, pair_j, pair_corr, pair_spread, pair_profit = ([a[best]] for a in merged)
+                kept = top_k
+                
+        if not pair_i:
+            return []
+            
+        pairs = (np.concatenate(a) for a in (pair_i, pair_j, pair_corr, pair_spread, pair_profit))
+        return self._rank_pairs(ids, *pairs, top_k=top_k)
+    
+    def _scan_approximate(self, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """LSH variant of the scan for universes too large for n x n work
+        
+        Sketches the same standardized price windows the exact scan
+        correlates, so it finds the same pairs (never extra ones), each
+        pair at the threshold with probability APPROXIMATE_SCAN_RECALL.
+        """
+        ids, slots = self._correlation_universe()
+        if len(ids) < 2:
+            return []
+            
+        z = self._standardized_windows(slots)
+        i, j, correlation, _ = correlated_pairs_lsh(z, self.CORRELATION_THRESHOLD,
+                                                    recall=self.APPROXIMATE_SCAN_RECALL)
+        beliefs = self.price_store.field_values('belief_penetration', slots)
+        liquidity = self.price_store.field_values('liquidity_score', slots)
+        
+        spread = np.abs(beliefs[i] - beliefs[j])
+        keep = spread > self.ARBITRAGE_THRESHOLD
+        i, j, correlation, spread = i[keep], j[keep], correlation[keep], spread[keep]
+        profit = spread * np.minimum(liquidity[i], liquidity[j])
+        return self._rank_pairs(ids, i, j, correlation, spread, profit, top_k=top_k)
+    
+    @staticmethod
+    def _rank_pairs(ids: List[str], pair_i: np.ndarray, pair_j: np.ndarray, pair_corr: np.ndarray,
+                    pair_spread: np.ndarray, pair_profit: np.ndarray,
+                    top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Opportunity dicts for candidate pairs, most profitable first"""
+        if top_k is not None and len(pair_profit) > top_k:
+            best = np.argpartition(-pair_profit, top_k - 1)[:top_k]
+            order = best[np.argsort(-pair_profit[best], kind='stable')]
+        else:
+            order = np.argsort(-pair_profit, kind='stable')
+            
+        return [{
+            'narrative_1': ids[pair_i[k]],
+            'narrative_2': ids[pair_j[k]],
+            'correlation': float(pair_corr[k]),
+            'spread': float(pair_spread[k]),
+            'expected_profit': float(pair_profit[k])
+        } for k in order]
     
     def calculate_narrative_correlation(self, n1: NarrativeAsset, n2: NarrativeAsset) -> float:
         """Calculate correlation between two narrative price histories"""
-        if len(n1.price_history) < 30 or len(n2.price_history) < 30:
+        window = self.CORRELATION_WINDOW
+        if len(n1.price_history) < window or len(n2.price_history) < window:
             return 0.0
             
-        prices1 = np.array(list(n1.price_history)[-30:])
-        prices2 = np.array(list(n2.price_history)[-30:])
+        # Read from the running sums when both narratives are tracked
+        tracker = self.correlation_tracker
+        h1, h2 = n1.price_history, n2.price_history
+        if (isinstance(h1, PriceHistoryView) and isinstance(h2, PriceHistoryView)
+                and h1.store is self.price_store and h2.store is self.price_store):
+            ids, slots = self._correlation_universe()
+            if len(slots) <= self.STREAMING_CORRELATION_LIMIT:
+                tracker.refresh(slots)
+                correlation = tracker.pair_correlation(h1.slot, h2.slot)
+                if correlation is not None:
+                    return correlation
+            
+        prices1 = price_window(n1.price_history, window)
+        prices2 = price_window(n2.price_history, window)
         
         if len(prices1) != len(prices2):
             return 0.0
@@ -258,11 +1844,8 @@ class NarrativeVolatilityEngine:
         correlation = np.corrcoef(prices1, prices2)[0, 1]
         return correlation if not np.isnan(correlation) else 0.0
     
-    async def run_market_simulation(self, duration_hours: int = 24):
-        """Simulate market activity for testing"""
-        print(f"🚀 Starting {duration_hours}-hour market simulation...")
-        
-        # Create sample narratives
+    def _seed_sample_narratives(self, rng=np.random):
+        """Populate the engine with the demo narrative set"""
         sample_narratives = [
             "BRICS will replace the dollar by 2025",
             "AI will achieve consciousness within 5 years",
@@ -278,8 +1861,8 @@ class NarrativeVolatilityEngine:
                 content=content,
                 origin_platform="twitter",
                 timestamp=datetime.now(),
-                belief_penetration=np.random.uniform(0.1, 0.6),
-                liquidity_score=np.random.uniform(0.3, 0.9)
+                belief_penetration=rng.uniform(0.1, 0.6),
+                liquidity_score=rng.uniform(0.3, 0.9)
             )
             self.narrative_assets[narrative.id] = narrative
             
@@ -287,8 +1870,25 @@ class NarrativeVolatilityEngine:
             self.create_liquidity_pool(narrative.id, 10000)
             
             # Initialize price history
-            for _ in range(100):
-                narrative.price_history.append(np.random.uniform(0.1, 0.6))
+            narrative.price_history.extend(rng.uniform(0.1, 0.6, size=100))
+    
+    async def run_market_simulation(self, duration_hours: int = 24, fast_forward: bool = False,
+                                    n_paths: int = 1000, seed: Optional[int] = None):
+        """Simulate market activity for testing
+        
+        With ``fast_forward`` the run is headless: ``n_paths`` scenarios are
+        simulated as arrays by simulate_market_paths and the aggregate
+        distributions are returned instead of a market report.
+        """
+        if fast_forward:
+            if not self.narrative_assets:
+                self._seed_sample_narratives(np.random.default_rng(seed))
+            return self.simulate_market_paths(n_paths=n_paths, n_steps=duration_hours, seed=seed)
+            
+        print(f"🚀 Starting {duration_hours}-hour market simulation...")
+        
+        # Create sample narratives
+        self._seed_sample_narratives()
         
         # Simulate market activity
         for hour in range(duration_hours):
@@ -301,26 +1901,22 @@ class NarrativeVolatilityEngine:
                 narrative.belief_penetration = max(0, min(1, narrative.belief_penetration + change))
                 narrative.price_history.append(narrative.belief_penetration)
                 
-                # Update volatility
-                narrative.volatility_30d = self.calculate_narrative_volatility(narrative)
-                
-                # Update coherence rating
-                narrative.coherence_rating = self.rate_narrative_coherence(narrative)
+            # Update volatility and coherence ratings in bulk
+            self.refresh_narrative_metrics()
             
             # Calculate and display NVX
             nvx = self.calculate_nvx_index()
             print(f"📊 NVX Index: {nvx:.2f}")
             
             # Execute some random swaps
-            for _ in range(5):
-                narrative_id = np.random.choice(list(self.narrative_assets.keys()))
-                amount = np.random.uniform(10, 100)
-                direction = np.random.choice(['buy', 'sell'])
-                
-                result = self.execute_belief_swap(narrative_id, amount, direction)
-                if 'error' not in result:
-                    print(f"💱 Swap executed: {direction} {amount:.2f} units of {narrative_id}")
-                    print(f"   Price impact: {result['price_impact']:.4f}")
+            swap_ids = np.random.choice(list(self.narrative_assets.keys()), size=5)
+            amounts = np.random.uniform(10, 100, size=5)
+            directions = np.random.choice(['buy', 'sell'], size=5)
+            
+            results = self.execute_belief_swaps(swap_ids, amounts, directions)
+            for k in np.flatnonzero(results['valid']):
+                print(f"💱 Swap executed: {directions[k]} {amounts[k]:.2f} units of {swap_ids[k]}")
+                print(f"   Price impact: {results['price_impact'][k]:.4f}")
             
             # Check for arbitrage
             arb_ops = self.identify_arbitrage_opportunities()
@@ -340,27 +1936,184 @@ class NarrativeVolatilityEngine:
         print("\n✅ Market simulation complete!")
         return self.generate_market_report()
     
+    def simulate_market_paths(self, n_paths: int = 1000, n_steps: int = 24, seed: Optional[int] = None,
+                              belief_shock: float = 0.02, path_chunk: Optional[int] = None) -> Dict[str, Any]:
+        """Vectorized Monte Carlo of the hourly market loop
+        
+        Simulates n_paths x n_steps x K narratives with a seeded
+        np.random.Generator, reproducing run_market_simulation's dynamics
+        (clipped Gaussian belief shocks, rolling volatility over the history
+        window, coherence ratings, NVX and the correlation/spread arbitrage
+        rule) without touching engine state. Paths are processed in chunks
+        so the K x K correlation tensors stay bounded.
+        """
+        narratives = list(self.narrative_assets.values())
+        K, N, T = len(narratives), n_paths, n_steps
+        rng = np.random.default_rng(seed)
+        rating_names = list(self.RATING_THRESHOLDS)
+        
+        if K == 0 or T == 0:
+            return {'paths': N, 'steps': T, 'narratives': 0, 'nvx': np.zeros((N, T)),
+                    'arbitrage_counts': np.zeros((N, T), dtype=np.int64), 'summary': {}}
+            
+        # Shared starting state: each history (or the current belief if empty)
+        beliefs0 = np.array([n.belief_penetration for n in narratives])
+        liquidity = np.array([n.liquidity_score for n in narratives])
+        mutation = np.array([n.mutation_rate for n in narratives])
+        histories = [price_window(n.price_history) if len(n.price_history) else np.array([n.belief_penetration])
+                     for n in narratives]
+        
+        W = self.price_store.capacity - 1  # returns inside the volatility window
+        C = self.CORRELATION_WINDOW
+        eps = PriceHistoryStore.LOG_EPSILON
+        
+        # Initial return windows, left-aligned and zero-padded to W
+        initial_returns = np.zeros((K, max(W, 1)))
+        initial_count = np.zeros(K, dtype=np.int64)
+        price_tail = np.zeros((K, C))
+        tail_count = np.zeros(K, dtype=np.int64)
+        last_price = np.zeros(K)
+        for k, prices in enumerate(histories):
+            returns = np.diff(np.log(prices + eps))[-W:] if W > 0 else np.zeros(0)
+            initial_returns[k, :len(returns)] = returns
+            initial_count[k] = len(returns)
+            tail = prices[-C:]
+            price_tail[k, C - len(tail):] = tail
+            tail_count[k] = len(tail)
+            last_price[k] = prices[-1]
+        
+        thresholds = np.array([self.RATING_THRESHOLDS[name] for name in reversed(rating_names)])
+        ascending_names = np.array(list(reversed(rating_names)))
+        upper = np.triu(np.ones((K, K), dtype=bool), k=1)
+        
+        nvx = np.zeros((N, T))
+        arbitrage_counts = np.zeros((N, T), dtype=np.int64)
+        final_beliefs = np.zeros((N, K))
+        final_ratings = np.zeros((N, K), dtype=np.int64)
+        
+        chunk = path_chunk or max(1, min(N, 4_000_000 // max(K * K, C * K)))
+        for start in range(0, N, chunk):
+            n = min(chunk, N - start)
+            shocks = rng.normal(0, belief_shock, size=(T, n, K))
+            
+            beliefs = np.broadcast_to(beliefs0, (n, K)).copy()
+            previous = np.broadcast_to(last_price, (n, K)).copy()
+            sims = np.zeros((T, n, K))  # simulated returns, for eviction
+            sum_r = np.broadcast_to(initial_returns.sum(axis=1), (n, K)).copy()
+            sum_r2 = np.broadcast_to((initial_returns ** 2).sum(axis=1), (n, K)).copy()
+            window = np.broadcast_to(price_tail, (n, K, C)).copy()
+            
+            for t in range(T):
+                beliefs = np.clip(beliefs + shocks[t], 0, 1)
+                new_return = np.log(beliefs + eps) - np.log(previous + eps)
+                previous = beliefs
+                sims[t] = new_return
+                sum_r += new_return
+                sum_r2 += new_return ** 2
+                
+                # Slide the oldest return out once the window is full
+                total = initial_count + t + 1
+                evict = total > W
+                if evict.any():
+                    index = total - 1 - W  # position of the evicted return in the combined sequence
+                    from_initial = index < initial_count
+                    initial_part = initial_returns[np.arange(K), np.clip(index, 0, W - 1)]
+                    simulated_part = sims[np.clip(index - initial_count, 0, T - 1), :, np.arange(K)].T
+                    evicted = np.where(from_initial, initial_part, simulated_part)
+                    evicted = np.where(evict, evicted, 0.0)
+                    sum_r -= evicted
+                    sum_r2 -= evicted ** 2
+                    
+                count = np.minimum(total, W)
+                variance = np.maximum(sum_r2 / np.maximum(count, 1) - (sum_r / np.maximum(count, 1)) ** 2, 0.0)
+                vols = np.where(count >= 2, np.sqrt(variance) * PriceHistoryStore.ANNUALIZATION, 0.0)
+                
+                # NVX
+                weights = beliefs * liquidity
+                total_weight = weights.sum(axis=1)
+                nvx[start:start + n, t] = np.divide((weights * vols).sum(axis=1), total_weight,
+                                                    out=np.zeros(n), where=total_weight > 0) * 100
+                
+                # Arbitrage: correlated price windows with a wide belief spread
+                window[:, :, :-1] = window[:, :, 1:]
+                window[:, :, -1] = beliefs
+                eligible = np.minimum(tail_count + t + 1, C) >= C
+                centered = window - window.mean(axis=2, keepdims=True)
+                norms = np.sqrt((centered ** 2).sum(axis=2, keepdims=True))
+                z = np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 0)
+                correlation = z @ z.transpose(0, 2, 1)
+                spread = np.abs(beliefs[:, :, None] - beliefs[:, None, :])
+                pairs = ((correlation > self.CORRELATION_THRESHOLD) & (spread > self.ARBITRAGE_THRESHOLD)
+                         & upper & eligible[:, None] & eligible[None, :])
+                arbitrage_counts[start:start + n, t] = pairs.sum(axis=(1, 2))
+                
+            scores = coherence_scores_batch(vols, liquidity, mutation)
+            final_ratings[start:start + n] = len(rating_names) - np.searchsorted(
+                thresholds, np.nan_to_num(scores, nan=0.0), side='right')
+            final_beliefs[start:start + n] = beliefs
+        
+        rating_counts = np.stack([(final_ratings == i).sum(axis=0) for i in range(len(rating_names))], axis=1)
+        percentiles = [5, 50, 95]
+        return {
+            'paths': N,
+            'steps': T,
+            'narratives': K,
+            'seed': seed,
+            'nvx': nvx,
+            'arbitrage_counts': arbitrage_counts,
+            'final_beliefs': final_beliefs,
+            'summary': {
+                'nvx_final': dict(zip(['p5', 'p50', 'p95'], np.percentile(nvx[:, -1], percentiles).tolist()),
+                                  mean=float(nvx[:, -1].mean())) if T else {},
+                'nvx_mean_by_step': nvx.mean(axis=0).tolist(),
+                'arbitrage_mean_by_step': arbitrage_counts.mean(axis=0).tolist(),
+                'arbitrage_probability': float((arbitrage_counts > 0).mean()) if T else 0.0,
+                'rating_distribution': {
+                    narrative.id: dict(zip(rating_names, (rating_counts[k] / N).tolist()))
+                    for k, narrative in enumerate(narratives)
+                },
+                'final_belief': {
+                    narrative.id: dict(zip(['p5', 'p50', 'p95'],
+                                           np.percentile(final_beliefs[:, k], percentiles).tolist()))
+                    for k, narrative in enumerate(narratives)
+                }
+            }
+        }
+    
     def generate_market_report(self) -> Dict[str, Any]:
-        """Generate comprehensive market analysis report"""
+        """Generate comprehensive market analysis report
+        
+        Every figure is read from aggregates maintained on each update, so
+        the report costs O(k) rather than a pass over the universe.
+        Arbitrage opportunities come from the last scan (one scan runs if
+        there has been none); ``arbitrage_scan`` says when it ran and
+        whether the market has moved since.
+        """
+        if self._last_arbitrage_scan is None:
+            self.identify_arbitrage_opportunities()
+        scan_version, scanned_at, opportunities, _ = self._last_arbitrage_scan
+        store = self.price_store
+        
         report = {
             'timestamp': datetime.now().isoformat(),
             'market_overview': {
                 'total_narratives': len(self.narrative_assets),
-                'total_liquidity': sum(pool['total_liquidity'] for pool in self.liquidity_pools.values()),
-                'average_volatility': np.mean([n.volatility_30d for n in self.narrative_assets.values()]),
+                'total_liquidity': self.liquidity_pools.total_liquidity(),
+                'average_volatility': store.volatility_sum() / store.active_count if store.active_count else 0.0,
                 'nvx_current': self.volatility_index_history[-1]['nvx'] if self.volatility_index_history else 0
             },
             'top_narratives': [],
-            'rating_distribution': defaultdict(int),
-            'arbitrage_opportunities': self.identify_arbitrage_opportunities()[:5]
+            'rating_distribution': store.rating_counts(),
+            'arbitrage_opportunities': opportunities[:5],
+            'arbitrage_scan': {
+                'timestamp': scanned_at.isoformat(),
+                'stale': scan_version != self.market_version
+            }
         }
         
         # Top narratives by belief penetration
-        sorted_narratives = sorted(self.narrative_assets.values(), 
-                                 key=lambda x: x.belief_penetration, 
-                                 reverse=True)
-        
-        for narrative in sorted_narratives[:5]:
+        for slot in store.top_belief_slots(5):
+            narrative = self.narrative_assets[self._slot_ids[slot]]
             report['top_narratives'].append({
                 'id': narrative.id,
                 'content': narrative.content[:50] + '...',
@@ -369,10 +2122,6 @@ class NarrativeVolatilityEngine:
                 'rating': narrative.coherence_rating
             })
         
-        # Rating distribution
-        for narrative in self.narrative_assets.values():
-            report['rating_distribution'][narrative.coherence_rating] += 1
-        
         return report
 
 # Deployment functions
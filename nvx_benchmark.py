@@ -0,0 +1,358 @@
+import numpy as np
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+from narrative_volatility_engine import NarrativeVolatilityEngine, NarrativeAsset
+from narrative_order_book import benchmark_order_book
+from narrative_kernels import benchmark_kernel_backends
+from narrative_shards import ShardedUniverse
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+PERCENTILES = (50, 90, 99)
+
+def build_synthetic_universe(n_narratives: int, history_length: int = 100, n_factors: int = 8,
+                             seed: int = 0, backend: str = 'numpy',
+                             precision: str = 'float64') -> NarrativeVolatilityEngine:
+    """Engine holding ``n_narratives`` random-walk narratives with pools
+    
+    Prices follow one of ``n_factors`` common belief walks plus idiosyncratic
+    noise, so the universe contains both highly correlated clusters (and hence
+    arbitrage candidates) and unrelated narratives. Every narrative gets a
+    full ``history_length`` price history and a liquidity pool.
+    """
+    rng = np.random.default_rng(seed)
+    engine = NarrativeVolatilityEngine(history_length=history_length, backend=backend, precision=precision)
+    
+    factors = np.cumsum(rng.normal(0, 0.01, (n_factors, history_length)), axis=1)
+    membership = rng.integers(0, n_factors, n_narratives)
+    levels = rng.uniform(0.2, 0.8, n_narratives)
+    noise = rng.normal(0, 0.004, (n_narratives, history_length))
+    prices = np.clip(levels[:, None] + factors[membership] + noise, 0.01, 0.99)
+    
+    liquidity = rng.uniform(0.1, 1.0, n_narratives)
+    mutation = rng.uniform(0.0, 0.5, n_narratives)
+    pool_sizes = rng.uniform(10_000, 100_000, n_narratives)
+    now = datetime.now()
+    
+    for i in range(n_narratives):
+        narrative_id = f"SYN_{i:06d}"
+        engine.narrative_assets[narrative_id] = NarrativeAsset(
+            id=narrative_id,
+            content=f"Synthetic narrative {i}",
+            origin_platform='benchmark',
+            timestamp=now,
+            belief_penetration=float(prices[i, -1]),
+            volatility_30d=0.0,
+            liquidity_score=float(liquidity[i]),
+            coherence_rating='BBB',
+            mutation_rate=float(mutation[i]),
+            price_history=deque(prices[i].tolist(), maxlen=history_length)
+        )
+        engine.create_liquidity_pool(narrative_id, float(pool_sizes[i]))
+        
+    engine.refresh_narrative_metrics()
+    return engine
+
+def _summarize(latencies: List[float], items_per_call: int) -> Dict[str, float]:
+    latencies = np.asarray(latencies)
+    summary = {f'p{p}_ms': float(np.percentile(latencies, p) * 1e3) for p in PERCENTILES}
+    summary.update({
+        'mean_ms': float(latencies.mean() * 1e3),
+        'max_ms': float(latencies.max() * 1e3),
+        'calls_per_sec': float(1.0 / latencies.mean()),
+        'items_per_sec': float(items_per_call / latencies.mean())
+    })
+    return summary
+
+def measure(operation: Callable[[], Any], iterations: int, items_per_call: int = 1,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Latency percentiles, throughput and peak traced memory of one operation
+    
+    ``setup`` runs untimed before every call; it is how cached operations
+    are made to see a fresh market tick. Peak memory comes from a separate
+    traced call so tracemalloc overhead does not skew the latencies.
+    """
+    latencies = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+        
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    result = _summarize(latencies, items_per_call)
+    result['peak_memory_mb'] = peak / 2 ** 20
+    result['iterations'] = iterations
+    return result
+
+def benchmark_universe(n_narratives: int, history_length: int = 100, iterations: int = 20,
+                       swap_batch: int = 1_000, scan_limit: int = 20_000, seed: int = 0,
+                       backend: str = 'numpy', precision: str = 'float64') -> Dict[str, Any]:
+    """Benchmark the engine's core operations on one synthetic universe
+    
+    Each timed call follows a one-price market tick, so the NVX and scan
+    caches never serve a stale answer. The arbitrage scan and market report
+    are quadratic in the universe and are skipped above ``scan_limit``.
+    """
+    start = time.perf_counter()
+    engine = build_synthetic_universe(n_narratives, history_length, seed=seed, backend=backend,
+                                      precision=precision)
+    build_seconds = time.perf_counter() - start
+    store_bytes = sum(column.nbytes for column in vars(engine.price_store).values()
+                      if isinstance(column, np.ndarray))
+    
+    rng = np.random.default_rng(seed + 1)
+    ids = list(engine.narrative_assets)
+    
+    def tick():
+        narrative = engine.narrative_assets[ids[rng.integers(n_narratives)]]
+        narrative.price_history.append(float(np.clip(narrative.belief_penetration + rng.normal(0, 0.01), 0.01, 0.99)))
+    
+    swap_ids = [ids[i] for i in rng.integers(0, n_narratives, swap_batch)]
+    swap_amounts = rng.uniform(1, 100, swap_batch)
+    swap_directions = np.where(rng.random(swap_batch) < 0.5, 'buy', 'sell')
+    single_swaps = iter(range(10 ** 9))
+    
+    def single_swap():
+        i = next(single_swaps) % swap_batch
+        engine.execute_belief_swap(swap_ids[i], float(swap_amounts[i]), str(swap_directions[i]))
+    
+    operations = {
+        'calculate_nvx_index': measure(engine.calculate_nvx_index, iterations, n_narratives, setup=tick),
+        'refresh_narrative_metrics': measure(engine.refresh_narrative_metrics, iterations, n_narratives, setup=tick),
+        'execute_belief_swap': measure(single_swap, iterations * 50),
+        'execute_belief_swaps': measure(
+            lambda: engine.execute_belief_swaps(swap_ids, swap_amounts, swap_directions),
+            iterations, swap_batch
+        ),
+    }
+    
+    if n_narratives <= scan_limit:
+        operations['identify_arbitrage_opportunities'] = measure(
+            engine.identify_arbitrage_opportunities, iterations, n_narratives, setup=tick)
+        operations['generate_market_report'] = measure(
+            engine.generate_market_report, iterations, n_narratives, setup=tick)
+    else:
+        skipped = {'skipped': f'universe above scan_limit={scan_limit}'}
+        operations['identify_arbitrage_opportunities'] = skipped
+        operations['generate_market_report'] = skipped
+        
+    return {
+        'narratives': n_narratives,
+        'history_length': history_length,
+        'build_seconds': build_seconds,
+        'price_store_mb': store_bytes / 2 ** 20,
+        'operations': operations
+    }
+
+def benchmark_lsh_recall(n_narratives: int = 2_000, history_length: int = 100,
+                         recalls=(0.8, 0.95, 0.99), seed: int = 0) -> Dict[str, Any]:
+    """Recall and speed of the approximate arbitrage scan against the exact one
+    
+    Recall is the share of the exact scan's pairs the LSH scan also finds;
+    ``near_threshold_recall`` restricts that to pairs within 0.05 of the
+    correlation threshold, which are the hardest to find.
+    """
+    engine = build_synthetic_universe(n_narratives, history_length, n_factors=max(8, n_narratives // 20),
+                                      seed=seed)
+    engine.STREAMING_CORRELATION_LIMIT = 0  # time the blocked exact scan, not the running sums
+    
+    start = time.perf_counter()
+    exact = engine.identify_arbitrage_opportunities(approximate=False)
+    exact_seconds = time.perf_counter() - start
+    exact_pairs = {(o['narrative_1'], o['narrative_2']) for o in exact}
+    near_pairs = {(o['narrative_1'], o['narrative_2']) for o in exact
+                  if o['correlation'] < engine.CORRELATION_THRESHOLD + 0.05}
+    
+    targets = []
+    for recall in recalls:
+        engine.APPROXIMATE_SCAN_RECALL = recall
+        start = time.perf_counter()
+        found = engine.identify_arbitrage_opportunities(approximate=True)
+        seconds = time.perf_counter() - start
+        found_pairs = {(o['narrative_1'], o['narrative_2']) for o in found}
+        targets.append({
+            'target_recall': recall,
+            'recall': len(found_pairs & exact_pairs) / max(len(exact_pairs), 1),
+            'near_threshold_recall': len(found_pairs & near_pairs) / max(len(near_pairs), 1),
+            'false_positives': len(found_pairs - exact_pairs),
+            'seconds': seconds
+        })
+        
+    return {
+        'narratives': n_narratives,
+        'exact_pairs': len(exact_pairs),
+        'exact_seconds': exact_seconds,
+        'targets': targets
+    }
+
+def synthetic_shard_scan(ids, contents, columns, top_k, context, cache):
+    """Pure-Python per-narrative scoring standing in for the signal modules
+    
+    Costs about ``context['work']`` interpreter steps per narrative, like
+    the per-narrative scoring of a real shard scan, and returns the shard's
+    best ``top_k`` (score, id) pairs.
+    """
+    work = context['work']
+    beliefs = columns['belief_penetration'].tolist()
+    vols = columns['volatility_30d'].tolist()
+    liquidity = columns['liquidity_score'].tolist()
+    scored = []
+    for narrative_id, belief, vol, depth in zip(ids, beliefs, vols, liquidity):
+        score = 0.0
+        for step in range(work):
+            score = 0.5 * score + belief * vol * depth / (1 + step)
+        scored.append((score, narrative_id))
+    return sorted(scored, key=lambda result: (-result[0], result[1]))[:top_k]
+
+def benchmark_sharded_scan(n_narratives: int = 20_000, shard_counts=(1, 2, 4, 8), iterations: int = 5,
+                           work: int = 200, top_k: int = 100, seed: int = 0) -> Dict[str, Any]:
+    """Scan throughput of a ShardedUniverse against an in-process scan
+    
+    Worker start-up is excluded (one warm-up scan per shard count). Every
+    scan reads one market snapshot, and each sharded result is checked
+    against the single-process top ``top_k``.
+    Speedup can only approach the shard count when that many CPUs are free.
+    """
+    engine = build_synthetic_universe(n_narratives, 40, seed=seed)
+    context = {'work': work}
+    snapshot = engine.market_snapshot(top_k=top_k)
+    columns = {name: np.asarray(getattr(snapshot, attribute), dtype=np.float64)
+               for name, attribute in ShardedUniverse.SNAPSHOT_COLUMNS.items() if name != 'coherence_rating'}
+    ids = list(snapshot.ids)
+    contents = [engine.narrative_assets[narrative_id].content for narrative_id in ids]
+    
+    scan_in_process = lambda: synthetic_shard_scan(ids, contents, columns, top_k, context, {})
+    reference = scan_in_process()
+    in_process = measure(scan_in_process, iterations, n_narratives)
+    
+    runs = []
+    for shards in shard_counts:
+        universe = ShardedUniverse(engine, shards, synthetic_shard_scan, key=lambda result: (-result[0], result[1]))
+        try:
+            result = universe.scan(snapshot, top_k, context)
+            stats = measure(lambda: universe.scan(snapshot, top_k, context), iterations, n_narratives)
+        finally:
+            universe.close()
+        stats.update(shards=shards, speedup=in_process['p50_ms'] / stats['p50_ms'],
+                     matches_in_process=result == reference)
+        runs.append(stats)
+        
+    return {
+        'narratives': n_narratives,
+        'cpus': os.cpu_count(),
+        'in_process': in_process,
+        'sharded': runs
+    }
+
+def run_benchmark_suite(sizes=DEFAULT_SIZES, history_length: int = 100, iterations: int = 20,
+                        scan_limit: int = 20_000, seed: int = 0, backend: str = 'numpy',
+                        include_components: bool = True, precision: str = 'float64') -> Dict[str, Any]:
+    """Run every universe size and collect one JSON-serializable result"""
+    results = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'backend': backend,
+            'precision': precision,
+            'history_length': history_length,
+            'iterations': iterations,
+            'seed': seed
+        },
+        'universes': [benchmark_universe(n, history_length, iterations, scan_limit=scan_limit,
+                                         seed=seed, backend=backend, precision=precision) for n in sizes]
+    }
+    if include_components:
+        results['order_book'] = benchmark_order_book(n_orders=50_000, seed=seed)
+        results['kernels'] = benchmark_kernel_backends(
+            sizes=tuple(n for n in sizes if n <= 10_000) or (min(sizes),), seed=seed)
+        results['lsh_recall'] = benchmark_lsh_recall(min(min(sizes), 2_000), history_length, seed=seed)
+    return results
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    metric: str = 'p50_ms', tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """Operations whose ``metric`` grew by more than ``tolerance`` versus a baseline run"""
+    previous = {
+        (universe['narratives'], name): stats.get(metric)
+        for universe in baseline.get('universes', [])
+        for name, stats in universe['operations'].items()
+    }
+    regressions = []
+    for universe in current['universes']:
+        for name, stats in universe['operations'].items():
+            before = previous.get((universe['narratives'], name))
+            after = stats.get(metric)
+            if before and after and after > before * (1 + tolerance):
+                regressions.append({
+                    'narratives': universe['narratives'],
+                    'operation': name,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': after / before
+                })
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for NarrativeVolatilityEngine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="universe sizes (number of narratives)")
+    parser.add_argument('--history', type=int, default=100, help="price history length per narrative")
+    parser.add_argument('--iterations', type=int, default=20, help="timed calls per operation")
+    parser.add_argument('--scan-limit', type=int, default=20_000,
+                        help="largest universe for the quadratic arbitrage scan and report")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=('numpy', 'jax'), default='numpy')
+    parser.add_argument('--precision', choices=('float64', 'float32'), default='float64',
+                        help="price store dtype")
+    parser.add_argument('--shards', type=int, nargs='+',
+                        help="also benchmark a sharded scan of the largest size with these worker counts")
+    parser.add_argument('--skip-components', action='store_true',
+                        help="skip the order book and kernel micro-benchmarks")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    parser.add_argument('--baseline', help="earlier JSON result to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed p50 slowdown versus the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    
+    results = run_benchmark_suite(args.sizes, args.history, args.iterations, args.scan_limit,
+                                  args.seed, args.backend, not args.skip_components, args.precision)
+    if args.shards:
+        results['sharded_scan'] = benchmark_sharded_scan(max(args.sizes), args.shards,
+                                                         iterations=args.iterations, seed=args.seed)
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), results, tolerance=args.tolerance)
+        results['regressions'] = regressions
+        
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import numpy as np
+import os
+import time
+from typing import Dict, Optional, Any, Union
+from datetime import datetime, timezone
+
+# Fixed-width record: 24 bytes per NVX point
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'),
+    ('nvx', '<f8'),
+    ('component_count', '<i8'),
+])
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('format_version', '<u4'),
+    ('record_size', '<u4'),
+    ('count', '<i8'),
+    ('reserved', 'V40'),
+])
+
+MAGIC = b'NVXSERIE'
+FORMAT_VERSION = 1
+
+Timestamp = Union[int, datetime, np.datetime64]
+
+def timestamps_to_ns(values) -> np.ndarray:
+    """int64 nanoseconds for datetimes or datetime64 values (naive values are UTC); ints pass through"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64)
+    return values.astype('datetime64[ns]').astype(np.int64)
+
+def to_ns(timestamp: Timestamp) -> int:
+    """Nanoseconds since the epoch for ints, datetimes and datetime64
+
+    Naive datetimes are read as UTC, as in ``timestamps_to_ns``; aware
+    ones are converted to UTC first.
+    """
+    if isinstance(timestamp, datetime) and timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return int(timestamps_to_ns([timestamp])[0])
+
+def from_ns(timestamp_ns: int) -> datetime:
+    """Naive UTC datetime for nanoseconds since the epoch (inverse of ``to_ns``)"""
+    return np.datetime64(int(timestamp_ns), 'ns').astype('datetime64[us]').item()
+
+class NVXTimeSeries:
+    """Append-only (timestamp_ns, nvx, component_count) series
+
+    With a ``path`` the records live in a memory-mapped file: a 64-byte
+    header followed by fixed 24-byte records. Reopening the file maps it
+    without reading it, so history survives restarts at no load cost.
+    Without a path the series is held in memory and, like the deque it
+    replaces, keeps only the latest ``max_records`` points.
+
+    Timestamps are kept non-decreasing so time-range queries are binary
+    searches. Integer indexing returns the legacy dict form
+    (``{'timestamp': datetime, 'nvx': ..., 'component_count': ...}``).
+    """
+
+    def __init__(self, path: Optional[str] = None, initial_capacity: int = 4096,
+                 max_records: Optional[int] = None):
+        self.path = path
+        self.max_records = max_records
+        self._header = None
+        self._start = 0  # first live record (moves only for bounded in-memory series)
+
+        if path is None:
+            capacity = 2 * max_records if max_records else initial_capacity
+            self._records = np.zeros(capacity, dtype=RECORD_DTYPE)
+            self._count = 0
+        elif os.path.exists(path) and os.path.getsize(path) >= HEADER_DTYPE.itemsize:
+            self._open_existing()
+        else:
+            self._create(initial_capacity)
+
+    # ------------------------------------------------------------- file layout
+
+    def _create(self, capacity: int):
+        with open(self.path, 'wb') as f:
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header['magic'] = MAGIC
+            header['format_version'] = FORMAT_VERSION
+            header['record_size'] = RECORD_DTYPE.itemsize
+            f.write(header.tobytes())
+            f.truncate(HEADER_DTYPE.itemsize + capacity * RECORD_DTYPE.itemsize)
+        self._map()
+
+    def _open_existing(self):
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)[0]
+        if header['magic'] != MAGIC or header['record_size'] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is not an NVX time series file")
+        self._map()
+
+    def _map(self):
+        size = os.path.getsize(self.path)
+        capacity = (size - HEADER_DTYPE.itemsize) // RECORD_DTYPE.itemsize
+        self._header = np.memmap(self.path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        self._records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r+',
+                                  offset=HEADER_DTYPE.itemsize, shape=(capacity,))
+        self._count = int(self._header['count'][0])
+
+    def _grow(self):
+        if self._header is None:
+            if self.max_records:
+                # Compact the live window to the front; amortized O(1) per append
+                live = self._count - self._start
+                self._records[:live] = self._records[self._start:self._count]
+                self._start, self._count = 0, live
+            else:
+                self._records = np.concatenate([self._records, np.zeros(len(self._records), dtype=RECORD_DTYPE)])
+            return
+
+        capacity = len(self._records)
+        self.flush()
+        del self._records, self._header
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_DTYPE.itemsize + 2 * capacity * RECORD_DTYPE.itemsize)
+        self._map()
+
+    # ------------------------------------------------------------------ writes
+
+    def append(self, nvx: float, component_count: int, timestamp: Optional[Timestamp] = None):
+        """Append one point; timestamps earlier than the last point are clamped"""
+        timestamp_ns = time.time_ns() if timestamp is None else to_ns(timestamp)
+        if len(self) and timestamp_ns < self._records['timestamp_ns'][self._count - 1]:
+            timestamp_ns = int(self._records['timestamp_ns'][self._count - 1])
+
+        if self._header is None and self.max_records and len(self) >= self.max_records:
+            self._start += 1  # drop the oldest point, deque-style
+        if self._count == len(self._records):
+            self._grow()
+
+        self._records[self._count] = (timestamp_ns, nvx, component_count)
+        self._count += 1
+        if self._header is not None:
+            # Publish the record only after it is written
+            self._header['count'] = self._count
+
+    def extend(self, timestamps_ns, nvx, component_counts):
+        """Append many points at once, with the same clamping as append"""
+        timestamps_ns = np.maximum.accumulate(np.asarray(timestamps_ns, dtype=np.int64))
+        if len(self):
+            timestamps_ns = np.maximum(timestamps_ns, self._records['timestamp_ns'][self._count - 1])
+
+        if self._header is None and self.max_records:
+            # Bounded series evict as they go; at most max_records points matter
+            for point in zip(np.asarray(nvx).tolist(), np.asarray(component_counts).tolist(),
+                             timestamps_ns.tolist()):
+                self.append(*point)
+            return
+
+        end = self._count + len(timestamps_ns)
+        while end > len(self._records):
+            self._grow()
+        block = self._records[self._count:end]
+        block['timestamp_ns'] = timestamps_ns
+        block['nvx'] = nvx
+        block['component_count'] = component_counts
+        self._count = end
+        if self._header is not None:
+            self._header['count'] = self._count
+
+    def flush(self):
+        if self._header is not None:
+            self._records.flush()
+            self._header.flush()
+
+    def close(self):
+        self.flush()
+        self._header = None
+        self._records = self.records.copy()
+        self._start, self._count = 0, len(self._records)
+
+    # ------------------------------------------------------------------- reads
+
+    @property
+    def records(self) -> np.ndarray:
+        """Zero-copy view of every stored record"""
+        return self._records[self._start:self._count]
+
+    def __len__(self) -> int:
+        return self._count - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.records[index]
+
+        record = self.records[index]
+        return {
+            'timestamp': from_ns(record['timestamp_ns']),
+            'nvx': float(record['nvx']),
+            'component_count': int(record['component_count'])
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def range(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> np.ndarray:
+        """Records with start <= timestamp < end, found by binary search"""
+        timestamps = self.records['timestamp_ns']
+        lo = 0 if start is None else np.searchsorted(timestamps, to_ns(start), side='left')
+        hi = len(self) if end is None else np.searchsorted(timestamps, to_ns(end), side='left')
+        return self.records[lo:hi]
+
+    def downsample(self, interval_ns: int, start: Optional[Timestamp] = None,
+                   end: Optional[Timestamp] = None, how: str = 'mean') -> Dict[str, np.ndarray]:
+        """Aggregate NVX into fixed-width time buckets
+
+        ``how`` is 'mean', 'last', 'min' or 'max'. Empty buckets are omitted.
+        Only the requested range is touched.
+        """
+        window = self.range(start, end)
+        if len(window) == 0:
+            return {'timestamp_ns': np.zeros(0, dtype=np.int64), 'nvx': np.zeros(0),
+                    'points': np.zeros(0, dtype=np.int64)}
+
+        timestamps = window['timestamp_ns']
+        buckets = (timestamps - timestamps[0]) // interval_ns
+        starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+        points = np.diff(np.r_[starts, len(window)])
+        nvx = np.asarray(window['nvx'])
+
+        if how == 'mean':
+            values = np.add.reduceat(nvx, starts) / points
+        elif how == 'last':
+            values = nvx[starts + points - 1]
+        elif how == 'min':
+            values = np.minimum.reduceat(nvx, starts)
+        elif how == 'max':
+            values = np.maximum.reduceat(nvx, starts)
+        else:
+            raise ValueError(f"Unknown aggregation: {how}")
+
+        return {
+            'timestamp_ns': timestamps[0] + buckets[starts] * interval_ns,
+            'nvx': values,
+            'points': points
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: self.records[name].copy() for name in RECORD_DTYPE.names}
@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta, timezone
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from narrative_order_book import LimitOrder, NarrativeOrderBook
+from narrative_volatility_engine import NarrativeAsset, NarrativeVolatilityEngine, RollingCorrelationTracker
+from nvx_timeseries import NVXTimeSeries, timestamps_to_ns, to_ns
+
+
+def _engine_with_flat_narrative():
+    engine = NarrativeVolatilityEngine(history_length=100)
+    engine.narrative_assets['N1'] = NarrativeAsset(
+        id='N1', content='flat narrative', origin_platform='test', timestamp=datetime(2024, 1, 1),
+        belief_penetration=0.5, liquidity_score=0.8, price_history=[0.5] * 10
+    )
+    return engine
+
+
+def test_extend_invalidates_nvx_and_snapshot():
+    engine = _engine_with_flat_narrative()
+    assert engine.calculate_nvx_index() == 0.0
+    before = engine.market_snapshot()
+    assert before.nvx == 0.0
+
+    version = engine.market_version
+    engine.narrative_assets['N1'].price_history.extend([0.3, 0.7, 0.2, 0.8])
+
+    assert engine.market_version != version
+    assert engine.calculate_nvx_index() > 0.0
+    after = engine.market_snapshot()
+    assert after is not before
+    assert after.nvx > 0.0
+
+
+def test_extend_notifies_subscribers():
+    engine = _engine_with_flat_narrative()
+    events = []
+    engine.subscribe(events.append)
+
+    engine.narrative_assets['N1'].price_history.extend([0.4, 0.6])
+
+    assert [(event.kind, event.narrative_id, event.value) for event in events] == [('price', 'N1', 0.6)]
+
+
+def test_incremental_correlation_matches_rebuild_over_flat_windows():
+    rng = np.random.default_rng(2)
+    engine = NarrativeVolatilityEngine(history_length=200)
+    for i in range(6):
+        engine.narrative_assets[f'N{i}'] = NarrativeAsset(
+            id=f'N{i}', content='', origin_platform='test', timestamp=datetime(2024, 1, 1),
+            belief_penetration=0.5, price_history=list(rng.uniform(0, 1, 40))
+        )
+    _, slots = engine._correlation_universe()
+    tracker = engine.correlation_tracker
+    tracker.refresh(slots)
+
+    for tick in range(100):
+        # The first three narratives collapse to a flat zero window
+        for i, narrative in enumerate(engine.narrative_assets.values()):
+            narrative.price_history.append(0.0 if i < 3 and tick > 20 else float(rng.uniform(0, 1)))
+        tracker.refresh(slots)
+
+    incremental = tracker.correlation_rows(0, len(slots))
+    rebuilt = RollingCorrelationTracker(engine.price_store, window=tracker.window)
+    rebuilt.rebuild(slots)
+    np.testing.assert_allclose(incremental, rebuilt.correlation_rows(0, len(slots)), atol=1e-9)
+    assert np.abs(incremental).max() <= 1.0
+    assert not incremental[:3, :3].any()
+
+
+def _system_with_position(rating):
+    unified = pytest.importorskip('unified_arbitrage_system')
+    engine = _engine_with_flat_narrative()
+    engine.narrative_assets['N1'].coherence_rating = rating
+    system = unified.UnifiedArbitrageSystem(engine, max_workers=1)
+    opened = system.open_position('N1_NVDA', {
+        'trade': {'narrative_id': 'N1', 'direction': 'long', 'size': 100.0},
+        'execution': {}, 'entry_time': datetime(2024, 1, 1), 'entry_belief': 0.5
+    })
+    return system, opened
+
+
+def _run_monitor(system, during=lambda: None):
+    async def monitor_once():
+        monitor = asyncio.create_task(system.monitor_and_rebalance())
+        await asyncio.sleep(0)
+        during()
+        monitor.cancel()
+    asyncio.run(monitor_once())
+
+
+def test_position_on_collapsed_narrative_closes_at_once():
+    system, opened = _system_with_position('D')
+    assert not opened
+    assert 'N1_NVDA' not in system.active_positions
+    assert system.pnl_tracker['positions'][-1]['reason'] == 'narrative_collapse'
+
+
+def test_monitor_catches_up_from_current_ratings():
+    system, opened = _system_with_position('AA')
+    engine = system.narrative_engine
+    assert opened
+    # Collapsed while nothing was subscribed, and without a rate_all_narratives transition
+    engine.narrative_assets['N1'].coherence_rating = 'D'
+    engine.rating_transitions.append(('N2', 'AA', 'D'))
+
+    _run_monitor(system)
+
+    assert 'N1_NVDA' not in system.active_positions
+    assert list(engine.rating_transitions) == [('N2', 'AA', 'D')]
+
+
+def test_monitor_closes_position_on_direct_rating_write():
+    system, _ = _system_with_position('AA')
+    still_open = []
+
+    def collapse():
+        still_open.append('N1_NVDA' in system.active_positions)
+        system.narrative_engine.narrative_assets['N1'].coherence_rating = 'D'
+
+    _run_monitor(system, collapse)
+
+    assert still_open == [True]
+    assert 'N1_NVDA' not in system.active_positions
+
+
+def test_order_beyond_depth_is_rejected_with_its_own_status():
+    book = NarrativeOrderBook('N1', depth=1)
+    book.submit(LimitOrder(1, 'N1', 'sell', 0.6, 5.0))
+    book.submit(LimitOrder(2, 'N1', 'buy', 0.4, 5.0))
+
+    # Fills 5 at 0.6, but the bid side is full, so the remainder cannot rest
+    partly = LimitOrder(3, 'N1', 'buy', 0.6, 8.0)
+    fills = book.submit(partly)
+    unfilled = LimitOrder(4, 'N1', 'buy', 0.5, 1.0)
+    book.submit(unfilled)
+
+    assert [fill.quantity for fill in fills] == [5.0]
+    assert partly.status == 'partial_rejected' and partly.remaining == 3.0
+    assert unfilled.status == 'rejected'
+    assert set(book._orders) == {2}
+    assert book.depth_snapshot() == {'bids': [(0.4, 5.0)], 'asks': []}
+
+
+def test_submit_rejects_non_positive_orders():
+    book = NarrativeOrderBook('N1')
+    for price, quantity in ((0.0, 1.0), (1.0, 0.0), (-1.0, 1.0), (float('nan'), 1.0)):
+        with pytest.raises(ValueError):
+            book.submit(LimitOrder(1, 'N1', 'buy', price, quantity))
+
+
+def _order_flow(seed, n_runs=400):
+    rng = np.random.default_rng(seed)
+    flow = []
+    for _ in range(n_runs):
+        side = 'buy' if rng.random() < 0.5 else 'sell'
+        price = float(np.round(0.5 + rng.normal(0, 0.01), 3))
+        flow += [(side, price, float(quantity)) for quantity in rng.uniform(1, 50, rng.integers(1, 6))]
+    return flow
+
+
+def test_submit_batch_matches_one_by_one_submission():
+    flow = _order_flow(4)
+    single, batched = NarrativeOrderBook('N1', depth=10), NarrativeOrderBook('N1', depth=10)
+    single_orders = [LimitOrder(i, 'N1', *order) for i, order in enumerate(flow)]
+    batch_orders = [LimitOrder(i, 'N1', *order) for i, order in enumerate(flow)]
+
+    expected = [single.submit(order) for order in single_orders]
+
+    assert batched.submit_batch(batch_orders) == expected
+    assert ([(order.status, order.remaining) for order in batch_orders]
+            == [(order.status, order.remaining) for order in single_orders])
+    assert set(batched._orders) == set(single._orders)
+
+
+def test_engine_submit_orders_batches_per_narrative_with_pool_routes():
+    def engine_with_pools():
+        engine = NarrativeVolatilityEngine()
+        engine.liquidity_pools.create('A', 1000.0)
+        engine.liquidity_pools.create('B', 500.0)
+        return engine
+
+    # Runs keep their narrative, so each book sees same-price runs
+    orders = [dict(narrative_id='ABC'[round(price * 1000) % 3], side=side, price=price * 2, quantity=quantity)
+              for side, price, quantity in _order_flow(5, 150)]
+    single, batched = engine_with_pools(), engine_with_pools()
+
+    expected = [single.submit_order(**order) for order in orders]
+    results = batched.submit_orders(orders)
+
+    assert [(r['order_id'], r['status'], r['fills']) for r in results] == \
+        [(r['order_id'], r['status'], r['fills']) for r in expected]
+    assert any(fill.venue == 'amm' for r in results for fill in r['fills'])
+    with pytest.raises(ValueError):
+        batched.submit_orders([dict(narrative_id='A', side='buy', price=1.0, quantity=-1.0)])
+
+
+def test_pool_graph_rewires_pool_recreated_with_new_assets():
+    engine = NarrativeVolatilityEngine()
+    pools = engine.liquidity_pools
+    pools.create('P1', 100.0, base_asset='A', quote_asset='B')
+    pools.create('P2', 100.0, base_asset='B', quote_asset='C')
+    pools.create('P3', 100.0, base_asset='C', quote_asset='D')
+    assert engine.identify_pool_arbitrage_cycles() == []
+
+    # P3 now closes the loop back to A at a price that makes it profitable
+    pools.create('P3', 100.0, base_asset='C', quote_asset='A')
+    pools['P3']['counter_belief_reserves'] = 150.0
+    cycles = engine.identify_pool_arbitrage_cycles()
+
+    assert [cycle['assets'] for cycle in cycles] == [['A', 'B', 'C', 'A']]
+    assert cycles[0]['pools'] == ['P1', 'P2', 'P3']
+    graph = engine.pool_graph
+    assert not graph._out_edges[graph._node_of['D']] and not graph._in_edges[graph._node_of['D']]
+
+
+def test_naive_timestamps_are_utc_everywhere():
+    naive = datetime(2024, 3, 1, 12, 30, 0, 123456)
+    expected = (naive - datetime(1970, 1, 1)) // timedelta(microseconds=1) * 1000
+
+    assert to_ns(naive) == timestamps_to_ns([naive])[0] == expected
+    assert to_ns(np.datetime64(naive)) == expected
+    assert to_ns(naive.replace(tzinfo=timezone(timedelta(hours=2)))) == expected - 2 * 3600 * 10 ** 9
+
+    series = NVXTimeSeries()
+    series.append(1.0, 2, naive)
+    assert series[0]['timestamp'] == naive
+    assert len(series.range(naive, naive + timedelta(microseconds=1))) == 1
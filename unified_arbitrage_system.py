@@ -1,7 +1,12 @@
 import asyncio
+import heapq
+import inspect
 import numpy as np
+import os
+from itertools import count
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 import json
 
@@ -13,7 +18,9 @@ from reflexive_arbiter import evaluate_reflexive_pattern
 from execution_core import execute_trade
 
 # Import the main engine
-from numpy_funnyword_eh import NarrativeVolatilityEngine, NarrativeAsset
+from numpy_funnyword_eh import NarrativeVolatilityEngine, NarrativeAsset, MarketSnapshot, RATING_SCALE
+from narrative_shards import ShardedUniverse
+from narrative_mapping import NarrativeAssetMapper
 
 @dataclass
 class ArbitrageSignal:
@@ -27,56 +34,166 @@ class ArbitrageSignal:
     risk_score: float
     metadata: Dict[str, Any]
 
+def score_narratives(batch: List[Tuple[Dict[str, Any], str]]) -> List[Tuple[Dict, Dict]]:
+    """CPU-bound topology and flux scoring for (narrative_data, content) pairs
+    
+    Module-level so a process pool can run it.
+    """
+    return [(detect_topological_stress(narrative_data), map_narrative_velocity({'narrative': content}))
+            for narrative_data, content in batch]
+
+def scan_shard(ids: List[str], contents: List[str], columns: Dict[str, np.ndarray], top_k: int,
+               context: Dict[str, Any], cache: Dict[str, Any]) -> List['ArbitrageSignal']:
+    """ShardedUniverse scan function: a shard's best ``top_k`` signals, best first
+    
+    Runs inside a shard worker. Financial mappings and the probe thread
+    pool are built on the first scan and kept in ``cache``.
+    """
+    if 'system' not in cache:
+        cache['system'] = UnifiedArbitrageSystem(None, max_workers=1, asset_rules_path=context['asset_rules_path'])
+        cache['mappings'] = [cache['system'].map_content_to_financial(content) for content in contents]
+        cache['probe_pool'] = ThreadPoolExecutor(max_workers=context['max_concurrent_probes'])
+    system, mappings = cache['system'], cache['mappings']
+    
+    batch = []
+    for i, (narrative_id, content, mapping) in enumerate(zip(ids, contents, mappings)):
+        code = int(columns['coherence_rating'][i])
+        narrative_data = {
+            'id': narrative_id,
+            'belief': float(columns['belief_penetration'][i]),
+            'volatility': float(columns['volatility_30d'][i]),
+            'coherence': RATING_SCALE[code] if code >= 0 else None
+        }
+        batch.append((narrative_data, content, mapping))
+        
+    scores = score_narratives([(narrative_data, content) for narrative_data, content, _ in batch])
+    liquidity_signals = list(cache['probe_pool'].map(probe_liquidity_channels, [
+        {'asset': asset, 'narrative_correlation': correlation}
+        for _, _, mapping in batch for asset, correlation in mapping.items()
+    ]))
+    signals = system._build_signals(batch, scores, liquidity_signals, context['nvx'])
+    return heapq.nlargest(top_k, signals, key=lambda signal: signal.expected_profit)
+
 class UnifiedArbitrageSystem:
     """Master system orchestrating narrative-capital arbitrage"""
     
-    def __init__(self, narrative_engine: NarrativeVolatilityEngine):
+    PROFIT_TARGET = 0.2  # close once mark-to-market P&L exceeds this fraction of size
+    
+    def __init__(self, narrative_engine: NarrativeVolatilityEngine, max_workers: Optional[int] = None,
+                 max_concurrent_probes: int = 32, asset_rules_path: Optional[str] = None):
         self.narrative_engine = narrative_engine
+        # Keyword -> asset rules; None loads narrative_asset_rules.json
+        self.asset_rules_path = asset_rules_path
+        self.asset_mapper = NarrativeAssetMapper.from_file(asset_rules_path)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrent_probes = max_concurrent_probes
+        self._scoring_pool: Optional[ProcessPoolExecutor] = None  # created on first scan
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+        self._shards: Optional[ShardedUniverse] = None  # created on first scan_sharded
+        self.last_snapshot: Optional[MarketSnapshot] = None  # market view of the current cycle
         self.active_positions = {}
         self.signal_history = []
+        self.collapsed_narratives = set()  # narratives currently rated 'D'
+        
+        # Event-driven monitoring: positions per narrative, and per narrative the
+        # belief levels that hit each position's profit target. Longs sit in a
+        # min-heap (fire when belief rises above), shorts in a max-heap; entries
+        # of closed positions are skipped when they surface.
+        self._positions_by_narrative: Dict[str, set] = {}
+        self._profit_targets: Dict[str, Tuple[List, List]] = {}
+        self._target_sequence = count()
         self.pnl_tracker = {
             'realized': 0.0,
             'unrealized': 0.0,
             'positions': []
         }
         
-    async def scan_arbitrage_universe(self) -> List[ArbitrageSignal]:
-        """Scan for arbitrage opportunities across narrative and capital markets"""
-        signals = []
+    async def scan_arbitrage_universe(self, snapshot: Optional[MarketSnapshot] = None) -> List[ArbitrageSignal]:
+        """Scan for arbitrage opportunities across narrative and capital markets
         
-        # 1. Get narrative market state
-        nvx = self.narrative_engine.calculate_nvx_index()
-        narrative_arbs = self.narrative_engine.identify_arbitrage_opportunities()
-        
-        # 2. Analyze each narrative for capital market divergence
-        for narrative in self.narrative_engine.narrative_assets.values():
-            # Get narrative metrics
-            narrative_data = {
-                'id': narrative.id,
-                'belief': narrative.belief_penetration,
-                'volatility': narrative.volatility_30d,
-                'coherence': narrative.coherence_rating
-            }
-            
-            # Run signal generation modules
-            topology_signal = detect_topological_stress(narrative_data)
-            flux_signal = map_narrative_velocity({'narrative': narrative.content})
-            
-            # Map to financial assets
-            financial_mapping = self.map_narrative_to_financial(narrative)
+        Narrative state comes from ``snapshot`` (by default the engine's
+        snapshot of the current tick), which is kept as ``last_snapshot``
+        so sizing, execution and reporting see the same view.
+        
+        Narratives are split into about four batches per worker. Each batch
+        scores topology and flux in the process pool while its liquidity
+        probes run concurrently, at most ``max_concurrent_probes`` at a time
+        (coroutine probes on the loop, blocking ones on a thread pool).
+        Batches are merged as they complete, so wall time follows cores
+        and probe latency rather than the narrative count.
+        """
+        # 1. Get narrative market state, computed once per tick
+        snapshot = snapshot or self.narrative_engine.market_snapshot()
+        self.last_snapshot = snapshot
+        nvx = snapshot.nvx
+        
+        # 2. Gather what the workers need; the engine itself stays in this process.
+        # Narratives mapped to no financial asset cannot produce a signal;
+        # narratives removed since the snapshot was taken are skipped.
+        entries = []
+        narratives = self.narrative_engine.narrative_assets
+        for narrative_id in snapshot.ids:
+            narrative = narratives.get(narrative_id)
+            if narrative is None:
+                continue
+            content = narrative.content
+            financial_mapping = self.map_content_to_financial(content)
+            if not financial_mapping:
+                continue
+            entries.append((snapshot.narrative_data(narrative_id), content, financial_mapping))
+        if not entries:
+            return []
             
-            for asset, correlation in financial_mapping.items():
-                # Check for liquidity
-                liquidity_signal = probe_liquidity_channels({
-                    'asset': asset,
-                    'narrative_correlation': correlation
-                })
+        # 3. Fan out per batch and merge as batches finish
+        if self._scoring_pool is None:
+            self._scoring_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._probe_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_probes)
+        probe_slots = asyncio.Semaphore(self.max_concurrent_probes)
+        batch_size = -(-len(entries) // (4 * self.max_workers))
+        batches = [entries[start:start + batch_size] for start in range(0, len(entries), batch_size)]
+        
+        signals = []
+        for batch_signals in asyncio.as_completed([self._scan_batch(batch, nvx, probe_slots)
+                                                   for batch in batches]):
+            signals.extend(await batch_signals)
+        
+        return sorted(signals, key=lambda x: x.expected_profit, reverse=True)
+    
+    async def _probe(self, asset: str, correlation: float, probe_slots: asyncio.Semaphore) -> Dict:
+        """One liquidity probe, off the event loop and under the concurrency bound"""
+        request = {'asset': asset, 'narrative_correlation': correlation}
+        async with probe_slots:
+            if inspect.iscoroutinefunction(probe_liquidity_channels):
+                return await probe_liquidity_channels(request)
+            # The default executor is sized for CPUs, not for waiting on I/O
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._probe_pool, probe_liquidity_channels, request)
+    
+    async def _scan_batch(self, batch: List[Tuple[Dict, str, Dict[str, float]]], nvx: float,
+                          probe_slots: asyncio.Semaphore) -> List[ArbitrageSignal]:
+        """Signals for one batch of (narrative_data, content, financial_mapping)"""
+        loop = asyncio.get_running_loop()
+        scores = loop.run_in_executor(self._scoring_pool, score_narratives,
+                                      [(narrative_data, content) for narrative_data, content, _ in batch])
+        probes = asyncio.gather(*(self._probe(asset, correlation, probe_slots)
+                                  for _, _, mapping in batch for asset, correlation in mapping.items()))
+        scores, liquidity_signals = await asyncio.gather(scores, probes)
+        return self._build_signals(batch, scores, liquidity_signals, nvx)
+    
+    def _build_signals(self, batch: List[Tuple[Dict, str, Dict[str, float]]], scores: List[Tuple[Dict, Dict]],
+                       liquidity_signals: List[Dict], nvx: float) -> List[ArbitrageSignal]:
+        """Tradeable signals from a batch's module outputs (probes in mapping order)"""
+        signals = []
+        liquidity = iter(liquidity_signals)
+        for (narrative_data, _, mapping), (topology_signal, flux_signal) in zip(batch, scores):
+            for asset in mapping:
+                liquidity_signal = next(liquidity)
                 
                 # Generate unified signal
                 if self.is_tradeable_divergence(narrative_data, liquidity_signal):
-                    signal = ArbitrageSignal(
+                    signals.append(ArbitrageSignal(
                         timestamp=datetime.now(),
-                        narrative_id=narrative.id,
+                        narrative_id=narrative_data['id'],
                         financial_asset=asset,
                         signal_type=self.classify_signal_type(topology_signal, flux_signal),
                         strength=topology_signal['signal_strength'] * flux_signal['memetic_impact'],
@@ -88,32 +205,59 @@ class UnifiedArbitrageSystem:
                             'flux': flux_signal,
                             'liquidity': liquidity_signal
                         }
-                    )
-                    signals.append(signal)
+                    ))
+        return signals
+    
+    def scan_sharded(self, n_shards: Optional[int] = None, top_k: int = 100,
+                     snapshot: Optional[MarketSnapshot] = None) -> List[ArbitrageSignal]:
+        """Best ``top_k`` signals from a universe sharded across processes
         
-        return sorted(signals, key=lambda x: x.expected_profit, reverse=True)
+        Narratives are split by stable hash over ``n_shards`` workers
+        (default ``max_workers``). Each worker scores its shard against the
+        snapshot's belief, volatility, liquidity and rating columns, published
+        through shared memory, and returns only its local top ``top_k``, which
+        are k-way merged here. Workers persist between calls; changing
+        ``n_shards`` or the narrative set restarts them.
+        """
+        n_shards = n_shards or self.max_workers
+        if self._shards is None or self._shards.n_shards != n_shards:
+            self.close_shards()
+            self._shards = ShardedUniverse(self.narrative_engine, n_shards, scan_shard,
+                                           key=lambda signal: -signal.expected_profit)
+            
+        snapshot = snapshot or self.narrative_engine.market_snapshot()
+        self.last_snapshot = snapshot
+        context = {
+            'nvx': snapshot.nvx,
+            'max_concurrent_probes': self.max_concurrent_probes,
+            'asset_rules_path': self.asset_rules_path
+        }
+        return self._shards.scan(snapshot, top_k, context)
+    
+    def close_shards(self):
+        if self._shards is not None:
+            self._shards.close()
+            self._shards = None
     
-    def map_narrative_to_financial(self, narrative: NarrativeAsset) -> Dict[str, float]:
+    def close(self):
+        """Shut down the scoring process pool, probe threads and shard workers"""
+        self.close_shards()
+        if self._scoring_pool is not None:
+            self._scoring_pool.shutdown(cancel_futures=True)
+            self._probe_pool.shutdown(cancel_futures=True)
+            self._scoring_pool = self._probe_pool = None
+    
+    def map_narrative_to_financial(self, narrative: NarrativeAsset) -> Mapping[str, float]:
         """Map narratives to correlated financial assets"""
-        mapping = {}
+        return self.map_content_to_financial(narrative.content)
+    
+    def map_content_to_financial(self, content: str) -> Mapping[str, float]:
+        """Financial assets correlated with a narrative's content
         
-        # Example mappings (would be ML-driven in production)
-        if "BRICS" in narrative.content or "dollar" in narrative.content:
-            mapping['DXY'] = -0.8  # Dollar index negative correlation
-            mapping['GLD'] = 0.7   # Gold positive correlation
-            mapping['CNY'] = 0.6   # Yuan correlation
-            
-        if "AI" in narrative.content or "consciousness" in narrative.content:
-            mapping['NVDA'] = 0.9  # AI stocks
-            mapping['MSFT'] = 0.7
-            mapping['GOOGL'] = 0.6
-            
-        if "collapse" in narrative.content or "corrupt" in narrative.content:
-            mapping['VIX'] = 0.8   # Volatility index
-            mapping['TLT'] = 0.5   # Bonds (flight to safety)
-            mapping['BTC'] = 0.4   # Crypto (alternative system)
-            
-        return mapping
+        Rules come from the asset rules file (would be ML-driven in
+        production); the result is memoized per content and read-only.
+        """
+        return self.asset_mapper.map(content)
     
     def is_tradeable_divergence(self, narrative_data: Dict, liquidity_signal: Dict) -> bool:
         """Determine if divergence is large enough to trade"""
@@ -148,16 +292,19 @@ class UnifiedArbitrageSystem:
         
         return base_profit
     
-    async def execute_arbitrage_strategy(self, signals: List[ArbitrageSignal]):
-        """Execute trades based on signals"""
+    async def execute_arbitrage_strategy(self, signals: List[ArbitrageSignal],
+                                         snapshot: Optional[MarketSnapshot] = None):
+        """Execute trades based on signals, against the scan's market snapshot"""
+        snapshot = snapshot or self.last_snapshot or self.narrative_engine.market_snapshot()
         
         for signal in signals[:5]:  # Top 5 signals
             # Use reflexive arbiter to determine strategy
             strategy = evaluate_reflexive_pattern({
                 'signal': signal,
                 'market_state': {
-                    'nvx': signal.metadata['nvx'],
-                    'narrative_positions': len(self.active_positions)
+                    'nvx': snapshot.nvx,
+                    'narrative_positions': len(self.active_positions),
+                    'arbitrage_opportunities': snapshot.arbitrage_opportunities
                 }
             })
             
@@ -170,18 +317,24 @@ class UnifiedArbitrageSystem:
                     'direction': 'long' if signal.signal_type == 'narrative_leads' else 'short',
                     'size': self.calculate_position_size(signal, strategy),
                     'strategy': strategy['strategy'],
-                    'metadata': signal.metadata
+                    'metadata': signal.metadata,
+                    'market_version': snapshot.version
                 }
                 
                 # Execute trade
                 execution_result = execute_trade(trade_package)
                 
                 if execution_result['status'] == 'executed':
-                    self.active_positions[f"{signal.narrative_id}_{signal.financial_asset}"] = {
+                    if signal.narrative_id in snapshot:
+                        entry_belief = snapshot.belief(signal.narrative_id)
+                    else:
+                        entry_belief = self.narrative_engine.narrative_assets[signal.narrative_id].belief_penetration
+                    self.open_position(f"{signal.narrative_id}_{signal.financial_asset}", {
                         'trade': trade_package,
                         'execution': execution_result,
-                        'entry_time': datetime.now()
-                    }
+                        'entry_time': datetime.now(),
+                        'entry_belief': entry_belief
+                    })
                     
                     print(f"✅ Executed: {strategy['strategy']} on {signal.financial_asset}")
                     print(f"   Narrative: {signal.narrative_id}")
@@ -207,45 +360,142 @@ class UnifiedArbitrageSystem:
         return position_fraction * 10000  # $10k base capital
     
     async def monitor_and_rebalance(self):
-        """Monitor positions and rebalance based on narrative shifts"""
-        while True:
-            for position_id, position in list(self.active_positions.items()):
-                # Check narrative state
-                narrative_id = position['trade']['narrative_id']
-                narrative = self.narrative_engine.narrative_assets.get(narrative_id)
+        """Monitor positions and rebalance based on narrative shifts
+        
+        Subscribes to engine events, then catches up once from the current
+        ratings and marks: collapsed narratives are those rated 'D' now,
+        whichever way the rating got there. From then on it reacts to
+        events until cancelled: a collapse to 'D' closes that narrative's
+        positions, and a belief update pops only the profit targets it
+        crosses. Exits happen inside the update that triggers them; nothing
+        is polled, and the engine's shared rating_transitions queue is left
+        to its other consumers.
+        """
+        self.narrative_engine.subscribe(self.on_narrative_event)
+        narratives = self.narrative_engine.narrative_assets
+        self.collapsed_narratives = {narrative_id for narrative_id, narrative in narratives.items()
+                                     if narrative.coherence_rating == 'D'}
+        for narrative_id in list(self._positions_by_narrative):
+            narrative = narratives.get(narrative_id)
+            if narrative_id in self.collapsed_narratives:
+                self._close_narrative(narrative_id)
+            elif narrative:
+                self._check_profit_targets(narrative_id, narrative.belief_penetration)
                 
-                if narrative:
-                    # Check for narrative collapse
-                    if narrative.coherence_rating == 'D':
-                        print(f"⚠️ Narrative collapsed: {narrative_id}")
-                        # Emergency exit
-                        self.close_position(position_id, reason='narrative_collapse')
-                    
-                    # Check for profit target
-                    elif self.calculate_position_pnl(position) > position['trade']['size'] * 0.2:
-                        print(f"💰 Profit target reached: {position_id}")
-                        self.close_position(position_id, reason='profit_target')
-            
-            await asyncio.sleep(60)  # Check every minute
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.narrative_engine.unsubscribe(self.on_narrative_event)
+    
+    def on_narrative_event(self, event):
+        """Engine subscriber: re-evaluate only the positions on the updated narrative"""
+        if event.kind == 'rating':
+            if event.value == 'D':
+                self.collapsed_narratives.add(event.narrative_id)
+                self._close_narrative(event.narrative_id)
+            else:
+                self.collapsed_narratives.discard(event.narrative_id)
+        elif event.kind == 'belief':
+            self._check_profit_targets(event.narrative_id, event.value)
+    
+    def _close_narrative(self, narrative_id: str):
+        if self._positions_by_narrative.get(narrative_id):
+            print(f"⚠️ Narrative collapsed: {narrative_id}")
+        narrative = self.narrative_engine.narrative_assets.get(narrative_id)
+        mark = narrative.belief_penetration if narrative else None
+        for position_id in list(self._positions_by_narrative.get(narrative_id, ())):
+            # Emergency exit at the live belief
+            self.close_position(position_id, reason='narrative_collapse', mark=mark)
+    
+    def _check_profit_targets(self, narrative_id: str, belief: float):
+        targets = self._profit_targets.get(narrative_id)
+        if targets is None:
+            return
+        longs, shorts = targets
+        while longs and belief > longs[0][0]:
+            _, _, position_id, position = heapq.heappop(longs)
+            if self.active_positions.get(position_id) is position:
+                print(f"💰 Profit target reached: {position_id}")
+                self.close_position(position_id, reason='profit_target', mark=belief)
+        while shorts and belief < -shorts[0][0]:
+            _, _, position_id, position = heapq.heappop(shorts)
+            if self.active_positions.get(position_id) is position:
+                print(f"💰 Profit target reached: {position_id}")
+                self.close_position(position_id, reason='profit_target', mark=belief)
     
-    def calculate_position_pnl(self, position: Dict) -> float:
-        """Calculate P&L for a position"""
-        # Simplified - would use real price feeds
-        time_held = (datetime.now() - position['entry_time']).seconds / 3600
+    def open_position(self, position_id: str, position: Dict) -> bool:
+        """Record a position and index it for event-driven exits
+        
+        A position on a narrative that is already collapsed (rated 'D' or
+        in ``collapsed_narratives``) gets no later rating event, so it is
+        closed at once as a collapse exit. Returns whether it stays open.
+        """
+        if position_id in self.active_positions:
+            self._unindex_position(position_id, self.active_positions[position_id])
+        self.active_positions[position_id] = position
         
-        # Simulate P&L based on narrative volatility
         narrative_id = position['trade']['narrative_id']
+        self._positions_by_narrative.setdefault(narrative_id, set()).add(position_id)
+        entry = position['entry_belief']
+        if entry > 0:
+            longs, shorts = self._profit_targets.setdefault(narrative_id, ([], []))
+            if position['trade']['direction'] == 'long':
+                level = entry * (1 + self.PROFIT_TARGET)
+                heapq.heappush(longs, (level, next(self._target_sequence), position_id, position))
+            else:
+                level = entry * (1 - self.PROFIT_TARGET)
+                heapq.heappush(shorts, (-level, next(self._target_sequence), position_id, position))
+            position['profit_level'] = level
+            
         narrative = self.narrative_engine.narrative_assets.get(narrative_id)
+        if narrative_id in self.collapsed_narratives or (narrative and narrative.coherence_rating == 'D'):
+            self.collapsed_narratives.add(narrative_id)
+            self._close_narrative(narrative_id)
+            return False
+        return True
+    
+    def _unindex_position(self, position_id: str, position: Dict):
+        narrative_id = position['trade']['narrative_id']
+        positions = self._positions_by_narrative.get(narrative_id)
+        if positions is not None:
+            positions.discard(position_id)
+            if not positions:
+                # Nothing left to trigger; drop the stale heap entries with it
+                del self._positions_by_narrative[narrative_id]
+                self._profit_targets.pop(narrative_id, None)
+    
+    def calculate_position_pnl(self, position: Dict, snapshot: Optional[MarketSnapshot] = None,
+                               mark: Optional[float] = None) -> float:
+        """Mark-to-market P&L of a position on narrative belief
         
-        if narrative:
-            pnl = position['trade']['size'] * narrative.volatility_30d * time_held * np.random.normal(0.1, 0.5)
-            return pnl
-        return 0.0
+        size * (mark - entry) / entry for longs, the negative for shorts.
+        The mark is ``mark`` if given, else the belief in ``snapshot``
+        (default: the cycle's ``last_snapshot``) when it covers the
+        narrative, else the live belief.
+        """
+        entry = position.get('entry_belief', 0.0)
+        if entry <= 0:
+            return 0.0
+            
+        narrative_id = position['trade']['narrative_id']
+        if mark is None:
+            snapshot = snapshot or self.last_snapshot
+            if snapshot is not None and narrative_id in snapshot:
+                mark = snapshot.belief(narrative_id)
+            else:
+                narrative = self.narrative_engine.narrative_assets.get(narrative_id)
+                if not narrative:
+                    return 0.0
+                mark = narrative.belief_penetration
+                
+        sign = 1.0 if position['trade']['direction'] == 'long' else -1.0
+        return position['trade']['size'] * sign * (mark - entry) / entry
     
-    def close_position(self, position_id: str, reason: str):
+    def close_position(self, position_id: str, reason: str, mark: Optional[float] = None):
         """Close a position and record P&L"""
         position = self.active_positions.pop(position_id)
-        pnl = self.calculate_position_pnl(position)
+        self._unindex_position(position_id, position)
+        pnl = self.calculate_position_pnl(position, mark=mark)
         
         self.pnl_tracker['realized'] += pnl
         self.pnl_tracker['positions'].append({
@@ -257,14 +507,21 @@ class UnifiedArbitrageSystem:
         
         print(f"📊 Closed {position_id}: ${pnl:.2f} ({reason})")
     
-    def generate_performance_report(self) -> Dict[str, Any]:
-        """Generate comprehensive performance report"""
+    def generate_performance_report(self, snapshot: Optional[MarketSnapshot] = None) -> Dict[str, Any]:
+        """Generate comprehensive performance report against one market snapshot"""
+        snapshot = snapshot or self.last_snapshot
+        unrealized = sum(self.calculate_position_pnl(p, snapshot) for p in self.active_positions.values())
         return {
             'timestamp': datetime.now().isoformat(),
+            'market': {
+                'version': snapshot.version,
+                'as_of': snapshot.timestamp.isoformat(),
+                'nvx': snapshot.nvx
+            } if snapshot is not None else None,
             'pnl': {
                 'realized': self.pnl_tracker['realized'],
-                'unrealized': sum(self.calculate_position_pnl(p) for p in self.active_positions.values()),
-                'total': self.pnl_tracker['realized'] + sum(self.calculate_position_pnl(p) for p in self.active_positions.values())
+                'unrealized': unrealized,
+                'total': self.pnl_tracker['realized'] + unrealized
             },
             'positions': {
                 'active': len(self.active_positions),
@@ -348,13 +605,14 @@ async def run_unified_arbitrage():
     # Start monitoring task
     monitor_task = asyncio.create_task(arbitrage_system.monitor_and_rebalance())
     
-    # Main trading loop
+    # Main trading loop; each tick's snapshot is computed once and shared by every stage
+    snapshot = narrative_engine.market_snapshot()
     for cycle in range(10):  # 10 cycles for demo
         print(f"\n📍 ARBITRAGE CYCLE {cycle + 1}")
         print("-" * 40)
         
         # Scan for opportunities
-        signals = await arbitrage_system.scan_arbitrage_universe()
+        signals = await arbitrage_system.scan_arbitrage_universe(snapshot)
         print(f"🔍 Found {len(signals)} arbitrage signals")
         
         if signals:
@@ -368,7 +626,7 @@ async def run_unified_arbitrage():
                 print()
             
             # Execute strategies
-            await arbitrage_system.execute_arbitrage_strategy(signals)
+            await arbitrage_system.execute_arbitrage_strategy(signals, snapshot)
         
         # Update narrative states (simulate market movement)
         for narrative in narrative_engine.narrative_assets.values():
@@ -376,16 +634,17 @@ async def run_unified_arbitrage():
             change = np.random.normal(0, 0.03)
             narrative.belief_penetration = max(0.05, min(0.95, narrative.belief_penetration + change))
             narrative.price_history.append(narrative.belief_penetration)
-            narrative.volatility_30d = narrative_engine.calculate_narrative_volatility(narrative)
-            narrative.coherence_rating = narrative_engine.rate_narrative_coherence(narrative)
         
-        # Calculate NVX
-        nvx = narrative_engine.calculate_nvx_index()
-        print(f"\n📈 NVX Index: {nvx:.2f}")
+        # Bulk volatility and rating refresh; transitions feed the monitor
+        narrative_engine.refresh_narrative_metrics()
+        
+        # Snapshot the new tick; the next cycle's scan reuses it
+        snapshot = narrative_engine.market_snapshot()
+        print(f"\n📈 NVX Index: {snapshot.nvx:.2f}")
         
         # Show performance
         if cycle > 0:
-            report = arbitrage_system.generate_performance_report()
+            report = arbitrage_system.generate_performance_report(snapshot)
             print(f"\n💰 Performance Update:")
             print(f"   Total P&L: ${report['pnl']['total']:.2f}")
             print(f"   Active Positions: {report['positions']['active']}")
@@ -397,11 +656,12 @@ async def run_unified_arbitrage():
     print("\n" + "=" * 60)
     print("📊 FINAL ARBITRAGE REPORT")
     print("=" * 60)
-    final_report = arbitrage_system.generate_performance_report()
+    final_report = arbitrage_system.generate_performance_report(snapshot)
     print(json.dumps(final_report, indent=2, default=str))
     
     # Cancel monitoring
     monitor_task.cancel()
+    arbitrage_system.close()
 
 if __name__ == "__main__":
     asyncio.run(run_unified_arbitrage())
\ No newline at end of file